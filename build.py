@@ -1,11 +1,10 @@
+import io
 import os
 import shutil
 import zipfile
 from datetime import datetime
 from pathlib import Path
 
-from circup.commands import main as circup_cli
-
 # each path is a tuple that contains:
 # (path within learn repo, directory name to use inside of apps/)
 LEARN_PROJECT_PATHS = [
@@ -26,7 +25,7 @@ LEARN_PROJECT_PATHS = [
 
 
 def create_font_specific_zip(
-    font_path: Path, src_dir: Path, learn_projects_dir: Path, output_dir: Path
+    font_path: Path, src_dir: Path, learn_projects_dir: Path, output_dir: Path, hash_func=None
 ):
     # Get font name without extension
     font_name = font_path.stem
@@ -73,6 +72,10 @@ def create_font_specific_zip(
             lib_dir.mkdir(parents=True, exist_ok=True)
             shutil.copytree(libcache_dir, lib_dir, dirs_exist_ok=True)
         else:
+            # circup pulls in click and the rest of its CLI at import time, so
+            # only import it when the libs actually need installing
+            from circup.commands import main as circup_cli  # noqa: PLC0415
+
             # install launcher required libs
             circup_cli(["--path", temp_dir, "install", "--auto"], standalone_mode=False)
 
@@ -91,14 +94,16 @@ def create_font_specific_zip(
                 )
 
             # create libcache dir
-            libcache_dir.mkdir(parents=True)
+            libcache_dir.mkdir(parents=True, exist_ok=True)
 
             # copy the installed libs from temp_dir to cache
             shutil.copytree(lib_dir, libcache_dir, dirs_exist_ok=True)
 
         os.remove(temp_dir / "boot_out.txt")
-        # Create the final zip file
-        with zipfile.ZipFile(output_zip, "w", zipfile.ZIP_DEFLATED) as zf:
+        # Create the final zip file in memory, so it can be hashed without
+        # reading it back from disk
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
             for file_path in temp_dir.rglob("*"):
                 if file_path.is_file():
                     modification_time = datetime(2000, 1, 1, 0, 0, 0)
@@ -107,7 +112,10 @@ def create_font_specific_zip(
                     arcname = file_path.relative_to(temp_dir)
                     zf.write(file_path, arcname)
 
+        zip_bytes = zip_buffer.getbuffer()
+        output_zip.write_bytes(zip_bytes)
         print(f"Created {output_zip}")
+        return output_zip.name, hash_func(zip_bytes) if hash_func is not None else None
 
     finally:
         # Clean up temporary directory
@@ -123,7 +131,12 @@ def download_learn_projects():
     os.system("git clone https://github.com/adafruit/Adafruit_Learning_System_Guides.git")
 
 
-def main():
+def main(hash_func=None):
+    """Build a release zip per font into dist/.
+
+    :param hash_func: Optional callable taking a zip's bytes and returning its hash.
+    :return: dict mapping zip name to hash_func's result when hash_func is given.
+    """
     # download all learn project zips
     download_learn_projects()
 
@@ -149,13 +162,20 @@ def main():
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Process each font
+    zip_hashes = {}
     for font_path in fonts_dir.glob("*.lvfontbin"):
-        create_font_specific_zip(font_path, src_dir, learn_projects_dir, output_dir)
+        zip_name, zip_hash = create_font_specific_zip(
+            font_path, src_dir, learn_projects_dir, output_dir, hash_func
+        )
+        zip_hashes[zip_name] = zip_hash
 
     # delete libcache dir if it exists
     if libcache_dir.exists():
         shutil.rmtree(libcache_dir)
 
+    if hash_func is not None:
+        return zip_hashes
+
 
 if __name__ == "__main__":
     main()
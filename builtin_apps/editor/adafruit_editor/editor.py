@@ -6,6 +6,7 @@
 
 import gc
 import os
+import sys
 
 import microcontroller
 import supervisor
@@ -19,6 +20,14 @@ from adafruit_argv_file import argv_filename
 
 INPUT_DISPLAY_REFRESH_COOLDOWN = 0.3  # s
 SHOW_MEMFREE = False
+STATUS_REFRESH_INTERVAL = 1.0  # s
+DUMP_CHUNK_SIZE = 1024  # bytes
+_SPACE = ord(" ")
+_TILDE = ord("~")
+# palette mappings for the cursor cell and a plain cell, shared so moving
+# the cursor does not build new lists
+HL_ON = (1, 0)
+HL_OFF = (0, 1)
 
 
 class MaybeDisableReload:
@@ -51,17 +60,35 @@ def os_exists(filename):
 
 
 def gc_mem_free_hint():
-    if not SHOW_MEMFREE:
-        return ""
     if hasattr(gc, "mem_free"):
         gc.collect()
         return f" | free: {gc.mem_free()}"
     return ""
 
 
+def dump_lines(lines):
+    chunk = []
+    total = 0
+    for row in lines:
+        chunk.append(row)
+        total += len(row) + 1
+        if total >= DUMP_CHUNK_SIZE:
+            chunk.append("")
+            sys.stdout.write("\n".join(chunk))
+            chunk.clear()
+            total = 0
+    if chunk:
+        chunk.append("")
+        sys.stdout.write("\n".join(chunk))
+
+
 class Buffer:
     def __init__(self, lines):
-        self.lines = lines
+        self.lines = list(lines)
+        # rows edited since the last redraw, and the first row of a tail
+        # that shifted after a split or join (None if nothing shifted)
+        self.dirty = set()
+        self.dirty_from = None
 
     def __len__(self):
         return len(self.lines)
@@ -73,34 +100,47 @@ class Buffer:
     def bottom(self):
         return len(self) - 1
 
+    def _shifted(self, row):
+        if self.dirty_from is None or row < self.dirty_from:
+            self.dirty_from = row
+
+    def mark_clean(self):
+        self.dirty.clear()
+        self.dirty_from = None
+
     def insert(self, cursor, string):
         row, col = cursor.row, cursor.col
-        # print(f"len: {len(self.lines)}")
-        # print(f"row: {row}")
-        try:
-            current = self.lines.pop(row)
-        except IndexError:
-            current = ""
-        new = current[:col] + string + current[col:]
-        self.lines.insert(row, new)
+        if row < len(self.lines):
+            current = self.lines[row]
+            self.lines[row] = current[:col] + string + current[col:]
+        else:
+            self.lines.append(string)
+        self.dirty.add(row)
 
     def split(self, cursor):
         row, col = cursor.row, cursor.col
-        current = self.lines.pop(row)
-        self.lines.insert(row, current[:col])
+        current = self.lines[row]
+        self.lines[row] = current[:col]
         self.lines.insert(row + 1, current[col:])
+        self._shifted(row)
 
     def delete(self, cursor):
         row, col = cursor.row, cursor.col
-        if (row, col) < (self.bottom, len(self[row])):
-            current = self.lines.pop(row)
+        lines = self.lines
+        current = lines[row]
+        if row < len(lines) - 1 or col < len(current):
             if col < len(current):
-                new = current[:col] + current[col + 1:]
-                self.lines.insert(row, new)
+                lines[row] = current[:col] + current[col + 1:]
+                self.dirty.add(row)
             else:
-                nextline = self.lines.pop(row)
-                new = current + nextline
-                self.lines.insert(row, new)
+                lines[row] = current + lines.pop(row + 1)
+                self._shifted(row)
+
+    def dedent(self, cursor, n):
+        row, col = cursor.row, cursor.col
+        current = self.lines[row]
+        self.lines[row] = current[:col - n] + current[col:]
+        self.dirty.add(row)
 
 
 def clamp(x, lower, upper):
@@ -112,13 +152,7 @@ def clamp(x, lower, upper):
 
 
 def _count_leading_characters(text, char):
-    count = 0
-    for c in text:
-        if c == char:
-            count += 1
-        else:
-            break
-    return count
+    return len(text) - len(text.lstrip(char))
 
 
 class Cursor:
@@ -137,7 +171,7 @@ class Cursor:
         self._col_hint = col
 
     def _clamp_col(self, buffer):
-        self._col = min(self._col_hint, len(buffer[self.row]))
+        self._col = min(self._col_hint, len(buffer.lines[self.row]))
 
     def up(self, buffer):  # pylint: disable=invalid-name
         if self.row > 0:
@@ -146,32 +180,40 @@ class Cursor:
             # print(f"cursor pos: {self.row}, {self.col}")
 
     def down(self, buffer):
-        if self.row < len(buffer) - 1:
+        if self.row < len(buffer.lines) - 1:
             self.row += 1
             self._clamp_col(buffer)
             # print(f"cursor pos: {self.row}, {self.col}")
 
+    def jump(self, buffer, delta_rows):
+        row = max(min(self.row + delta_rows, len(buffer.lines) - 1), 0)
+        if row != self.row:
+            self.row = row
+            self._clamp_col(buffer)
+
     def left(self, buffer):
-        if self.col > 0:
-            self.col -= 1
+        col = self._col
+        if col > 0:
+            self._col = self._col_hint = col - 1
             # print(f"cursor pos: {self.row}, {self.col}")
         elif self.row > 0:
             self.row -= 1
-            self.col = len(buffer[self.row])
+            self._col = self._col_hint = len(buffer.lines[self.row])
             # print(f"cursor pos: {self.row}, {self.col}")
 
     def right(self, buffer):
-        # print(f"len: {len(buffer)}")
-        if len(buffer) > 0 and self.col < len(buffer[self.row]):
-            self.col += 1
+        lines = buffer.lines
+        col = self._col
+        if lines and col < len(lines[self.row]):
+            self._col = self._col_hint = col + 1
             # print(f"cursor pos: {self.row}, {self.col}")
-        elif self.row < len(buffer) - 1:
+        elif self.row < len(lines) - 1:
             self.row += 1
-            self.col = 0
+            self._col = self._col_hint = 0
             # print(f"cursor pos: {self.row}, {self.col}")
 
     def end(self, buffer):
-        self.col = len(buffer[self.row])
+        self._col = self._col_hint = len(buffer.lines[self.row])
         # print(f"cursor pos: {self.row}, {self.col}")
 
 
@@ -181,6 +223,9 @@ class Window:
         self.n_cols = n_cols
         self.row = row
         self.col = col
+        # cursor columns that map to the current horizontal scroll position
+        self._scroll_lo = 0
+        self._scroll_hi = 0
 
     @property
     def bottom(self):
@@ -191,11 +236,29 @@ class Window:
             self.row -= 1
 
     def down(self, buffer, cursor):
-        if cursor.row == self.bottom + 1 and self.bottom < len(buffer) - 1:
+        bottom = self.row + self.n_rows - 1
+        if cursor.row == bottom + 1 and bottom < len(buffer.lines) - 1:
             self.row += 1
 
+    def jump(self, cursor, old_row, delta_rows):
+        # where down()/up() would have left the window had the cursor stepped
+        # one row at a time from old_row; both keep firing while the cursor
+        # is pinned at the last/first row
+        row = cursor.row
+        if delta_rows > 0:
+            if min(old_row + 1, row) <= self.row + self.n_rows <= row:
+                self.row = row - self.n_rows + 1
+        elif row < self.row <= max(old_row, row + 1):
+            self.row = row
+
     def horizontal_scroll(self, cursor, left_margin=5, right_margin=2):
-        n_pages = cursor.col // (self.n_cols - right_margin)
+        col = cursor.col
+        if self._scroll_lo <= col < self._scroll_hi:
+            return
+        page_width = self.n_cols - right_margin
+        n_pages = col // page_width
+        self._scroll_lo = n_pages * page_width
+        self._scroll_hi = self._scroll_lo + page_width
         self.col = max(n_pages * self.n_cols - right_margin - left_margin, 0)
 
     def translate(self, cursor):
@@ -227,16 +290,13 @@ def end(window, buffer, cursor):
 def editor(stdscr, filename, mouse=None, terminal_tilegrid=None):  # pylint: disable=too-many-branches,too-many-statements
 
     def _only_spaces_before(cursor):
-        i = cursor.col - 1
-        while i >= 0:
-            print(f"i: {i} chr: '{buffer.lines[cursor.row][i]}'")
-            if buffer.lines[cursor.row][i] != " ":
-                return False
-            i -= 1
-        return True
+        return _count_leading_characters(buffer.lines[cursor.row], " ") >= cursor.col
+
     if os_exists(filename):
         with open(filename, "r", encoding="utf-8") as f:
-            buffer = Buffer(f.read().splitlines())
+            # stream the rows straight into the buffer rather than holding the
+            # whole file as one string plus a list of its lines
+            buffer = Buffer(line.rstrip("\r\n") for line in f)
     else:
         buffer = Buffer([""])
     print(f"cwd: {os.getcwd()} | {os.getcwd() == "/apps/editor"}")
@@ -253,11 +313,9 @@ def editor(stdscr, filename, mouse=None, terminal_tilegrid=None):  # pylint: dis
     find_command = False
     goto_command = False
 
-    clicked_tile_coords = [None, None]
-
     window = Window(curses.LINES - 1, curses.COLS - 1)
     cursor = Cursor()
-    terminal_tilegrid.pixel_shader[cursor.col,cursor.row] = [1, 0]
+    terminal_tilegrid.pixel_shader[cursor.col,cursor.row] = HL_ON
     old_cursor_pos = (cursor.col, cursor.row)
     old_window_pos = (window.col, window.row)
     # try:
@@ -268,38 +326,233 @@ def editor(stdscr, filename, mouse=None, terminal_tilegrid=None):  # pylint: dis
     stdscr.erase()
 
     img = [None] * curses.LINES
+    # row padding is sliced off this rather than built per row
+    spaces = " " * window.n_cols
 
     def setline(row, line):
         if img[row] == line:
             return
         img[row] = line
-        line += " " * (window.n_cols - len(line))
+        line += spaces[len(line):]
         stdscr.addstr(row, 0, line)
 
+    def drawline(row):
+        buf_row = window.row + row
+        if buf_row >= len(buffer.lines):
+            setline(row, "~~ EOF ~~")
+            return
+        line = buffer.lines[buf_row]
+        if buf_row == cursor.row and window.col > 0:
+            prefix = "«"
+            start = window.col + 1
+        else:
+            prefix = ""
+            start = 0
+        if len(prefix) + len(line) - start > window.n_cols:
+            line = prefix + line[start:start + window.n_cols - 1 - len(prefix)] + "»"
+        elif prefix:
+            line = prefix + line[start:]
+        setline(row, line)
+
+    def save_and_exit():  # Ctrl-X
+        if not util.readonly():
+            with open(filename, "w", encoding="utf-8") as f:
+                for row in buffer:
+                    f.write(f"{row}\n")
+            return True
+        print("Unable to Save due to readonly mode! File Contents:")
+        print("---- begin file contents ----")
+        dump_lines(buffer.lines)
+        print("---- end file contents ----")
+
+    def save():  # Ctrl-S
+        nonlocal user_message, user_message_shown_time
+        print(absolute_filepath)
+        print(f"starts with saves: {absolute_filepath.startswith("/saves/")}")
+        print(f"stars saves: {absolute_filepath.startswith("/saves/")}")
+        print(f"stars sd: {absolute_filepath.startswith("/sd/")}")
+        print(f"readonly: {util.readonly()}")
+        if (absolute_filepath.startswith("/saves/") or
+                absolute_filepath.startswith("/sd/") or
+                not util.readonly()):
+
+            with open(absolute_filepath, "w", encoding="utf-8") as f:
+                for row in buffer:
+                    f.write(f"{row}\n")
+                user_message = "Saved"
+                user_message_shown_time = time.monotonic()
+        else:
+            user_message = "Unable to Save due to readonly mode!"
+            user_message_shown_time = time.monotonic()
+
+    def dump():  # Ctrl-Q
+        print("ctrl-Q")
+        dump_lines(buffer.lines)
+
+    def toggle_readonly():  # Ctrl-W
+        boot_args_file = argv_filename("/boot.py")
+        # encode before opening so the flash write is a single call
+        payload = json.dumps([not util.readonly(), "/apps/editor/code.py", Path(filename).absolute()]).encode("utf-8")
+        with open(boot_args_file, "wb") as f:
+            f.write(payload)
+        microcontroller.reset()
+
+    def run():  # Ctrl-R
+        print(f"Run: {filename}")
+
+        path = Path(filename)
+        launcher_code_args_file = argv_filename("/code.py")
+        payload = json.dumps(["/apps/editor/code.py", path.absolute()]).encode("utf-8")
+        with open(launcher_code_args_file, "wb") as f:
+            f.write(payload)
+
+        supervisor.set_next_code_file(filename, sticky_on_reload=False, reload_on_error=True,
+            reload_on_success=True, working_directory=path.parent.absolute())
+        supervisor.reload()
+
+    def open_file():  # Ctrl-O
+        supervisor.set_next_code_file("/apps/editor/code.py", sticky_on_reload=False, reload_on_error=True,
+                                      working_directory="/apps/editor")
+        supervisor.reload()
+
+    def find():  # Ctrl-F
+        nonlocal find_command, user_prompt
+        find_command = True
+        if last_find == "":
+            user_prompt = "Find:"
+        else:
+            user_prompt = f"Find: [{last_find}]"
+
+    def goto():  # Ctrl-G
+        nonlocal goto_command, user_prompt
+        goto_command = True
+        user_prompt = "Goto line:"
+
+    def cursor_down():
+        cursor.down(buffer)
+        window.down(buffer, cursor)
+        window.horizontal_scroll(cursor)
+
+    def page(delta_rows):
+        old_row = cursor.row
+        cursor.jump(buffer, delta_rows)
+        window.jump(cursor, old_row, delta_rows)
+        window.horizontal_scroll(cursor)
+
+    def page_down():
+        page(window.n_rows)
+
+    def cursor_up():
+        cursor.up(buffer)
+        window.up(cursor)
+        window.horizontal_scroll(cursor)
+
+    def page_up():
+        page(-window.n_rows)
+
+    def newline():
+        leading_spaces = _count_leading_characters(buffer.lines[cursor.row], " ")
+        buffer.split(cursor)
+        right(window, buffer, cursor)
+        if leading_spaces:
+            buffer.insert(cursor, " " * leading_spaces)
+            cursor.col += leading_spaces
+            window.horizontal_scroll(cursor)
+
+    def delete():
+        print("delete")
+        if cursor.row < len(buffer.lines) - 1 or \
+                cursor.col < len(buffer.lines[cursor.row]):
+            buffer.delete(cursor)
+
+    def backspace():
+        print(f"backspace {bytes(k, 'utf-8')}")
+        if (cursor.row, cursor.col) > (0, 0):
+            if cursor.col > 0 and buffer.lines[cursor.row][cursor.col-1] == " " and _only_spaces_before(cursor):
+                # drop up to one indent level in a single slice, stopping at
+                # the start of the line
+                n = min(4, cursor.col)
+                buffer.dedent(cursor, n)
+                cursor.col -= n
+                window.horizontal_scroll(cursor)
+            else:
+                left(window, buffer, cursor)
+                buffer.delete(cursor)
+
+    # built once so each keystroke is a single dict lookup instead of a walk
+    # down an if/elif chain
+    key_handlers = {
+        "\x18": save_and_exit,
+        "\x13": save,
+        "\x11": dump,
+        "\x17": toggle_readonly,
+        "\x12": run,
+        "\x0f": open_file,
+        "\x06": find,
+        "\x07": goto,
+        "KEY_HOME": lambda: home(window, buffer, cursor),
+        "KEY_END": lambda: end(window, buffer, cursor),
+        "KEY_LEFT": lambda: left(window, buffer, cursor),
+        "KEY_RIGHT": lambda: right(window, buffer, cursor),
+        "KEY_DOWN": cursor_down,
+        "KEY_PGDN": page_down,
+        "KEY_UP": cursor_up,
+        "KEY_PGUP": page_up,
+        "\n": newline,
+        "KEY_DELETE": delete,
+        "\x04": delete,
+        "KEY_BACKSPACE": backspace,
+        "\x7f": backspace,
+        "\x08": backspace,
+    }
+
+    drawn_window_pos = None
+    drawn_cursor_row = None
+
     print(f"cwd: {os.getcwd()} | abs path: {absolute_filepath} | filename: {filename}")
     idle_cnt = 0
+    mem_free_hint = ""
+    # the status bar only changes with the mount mode or the memory hint, so
+    # it is rebuilt at most once per STATUS_REFRESH_INTERVAL
+    status_line = None
+    status_line_time = 0
+    status_path = f"{absolute_filepath:12}"
+    writable_path = absolute_filepath.startswith("/saves/") or absolute_filepath.startswith("/sd/")
     while True:
-        lastrow = 0
-        for row, line in enumerate(buffer[window.row: window.row + window.n_rows]):
-            lastrow = row
-            if row == cursor.row - window.row and window.col > 0:
-                line = "«" + line[window.col + 1:]
-            if len(line) > window.n_cols:
-                line = line[: window.n_cols - 1] + "»"
-            setline(row, line)
-        for row in range(lastrow + 1, window.n_rows):
-            setline(row, "~~ EOF ~~")
+        # only redraw rows touched by the last edit, unless the window scrolled
+        first_row = window.row
+        end_row = window.row + window.n_rows
+        if (window.col, window.row) != drawn_window_pos:
+            redraw_from = first_row
+        else:
+            redraw_from = end_row if buffer.dirty_from is None else min(max(buffer.dirty_from, first_row), end_row)
+            if window.col > 0 and cursor.row != drawn_cursor_row:
+                # the scrolled cursor row is drawn with a "«" prefix
+                buffer.dirty.add(cursor.row)
+                buffer.dirty.add(drawn_cursor_row)
+        for buf_row in buffer.dirty:
+            if first_row <= buf_row < redraw_from:
+                drawline(buf_row - first_row)
+        for row in range(redraw_from - first_row, window.n_rows):
+            drawline(row)
+        buffer.mark_clean()
+        drawn_window_pos = (window.col, window.row)
+        drawn_cursor_row = cursor.row
         row = curses.LINES - 1
 
         if user_message is None and user_prompt is None:
-            if (not absolute_filepath.startswith("/saves/") and
-                    not absolute_filepath.startswith("/sd/") and
-                    util.readonly()):
-
-                line = f"{absolute_filepath:12} (mnt RO ^W) | ^R Run | ^O Open | ^F Find | ^G GoTo | ^C quit {gc_mem_free_hint()}"
-            else:
-                line = f"{absolute_filepath:12} (mnt RW ^W) | ^R Run | ^O Open | ^F Find | ^G GoTo | ^S Save | ^X save & eXit | ^C quit {gc_mem_free_hint()}"
-            line = (line + " " * (window.n_cols - len(line)))[:window.n_cols]
+            now = time.monotonic()
+            if status_line is None or now - status_line_time >= STATUS_REFRESH_INTERVAL:
+                status_line_time = now
+                if SHOW_MEMFREE:
+                    mem_free_hint = gc_mem_free_hint()
+                if not writable_path and util.readonly():
+
+                    line = f"{status_path} (mnt RO ^W) | ^R Run | ^O Open | ^F Find | ^G GoTo | ^C quit {mem_free_hint}"
+                else:
+                    line = f"{status_path} (mnt RW ^W) | ^R Run | ^O Open | ^F Find | ^G GoTo | ^S Save | ^X save & eXit | ^C quit {mem_free_hint}"
+                status_line = (line + spaces[len(line):])[:window.n_cols]
+            line = status_line
             if idle_cnt >= 10:
                 line = line[:window.n_cols-len(f'{cursor.row+1},{cursor.col+1}')] + f"{cursor.row+1},{cursor.col+1}"
 
@@ -321,7 +574,7 @@ def editor(stdscr, filename, mouse=None, terminal_tilegrid=None):  # pylint: dis
             idle_cnt = 0
             # print(repr(k))
             if user_prompt is not None:
-                if len(k) == 1 and " " <= k <= "~":
+                if len(k) == 1 and _SPACE <= ord(k) <= _TILDE:
                     user_response += k
                 elif k == "\n":
                     user_prompt = None
@@ -375,145 +628,27 @@ def editor(stdscr, filename, mouse=None, terminal_tilegrid=None):  # pylint: dis
                     print(f"unhandled K: {ord(k)}")
                     print(f"unhandled k: {bytes(k, 'utf-8')}")
 
-            elif len(k) == 1 and " " <= k <= "~":
+            elif len(k) == 1 and _SPACE <= ord(k) <= _TILDE:
                 buffer.insert(cursor, k)
                 for _ in k:
                     right(window, buffer, cursor)
-            elif k == "\x18":  # ctrl-x
-                if not util.readonly():
-                    with open(filename, "w", encoding="utf-8") as f:
-                        for row in buffer:
-                            f.write(f"{row}\n")
-                    return
-                else:
-                    print("Unable to Save due to readonly mode! File Contents:")
-                    print("---- begin file contents ----")
-                    for row in buffer:
-                        print(row)
-                    print("---- end file contents ----")
-            elif k == "\x13":  # Ctrl-S
-                print(absolute_filepath)
-                print(f"starts with saves: {absolute_filepath.startswith("/saves/")}")
-                print(f"stars saves: {absolute_filepath.startswith("/saves/")}")
-                print(f"stars sd: {absolute_filepath.startswith("/sd/")}")
-                print(f"readonly: {util.readonly()}")
-                if (absolute_filepath.startswith("/saves/") or
-                        absolute_filepath.startswith("/sd/") or
-                        not util.readonly()):
-
-                    with open(absolute_filepath, "w", encoding="utf-8") as f:
-                        for row in buffer:
-                            f.write(f"{row}\n")
-                        user_message = "Saved"
-                        user_message_shown_time = time.monotonic()
-                else:
-                    user_message = "Unable to Save due to readonly mode!"
-                    user_message_shown_time = time.monotonic()
-            elif k == "\x11":  # Ctrl-Q
-                print("ctrl-Q")
-                for row in buffer:
-                    print(row)
-            elif k == "\x17":  # Ctrl-W
-                boot_args_file = argv_filename("/boot.py")
-                with open(boot_args_file, "w") as f:
-                    f.write(json.dumps([not util.readonly(), "/apps/editor/code.py", Path(filename).absolute()]))
-                microcontroller.reset()
-            elif k == "\x12":  # Ctrl-R
-                print(f"Run: {filename}")
-
-                launcher_code_args_file = argv_filename("/code.py")
-                with open(launcher_code_args_file, "w") as f:
-                    f.write(json.dumps(["/apps/editor/code.py", Path(filename).absolute()]))
-
-                supervisor.set_next_code_file(filename, sticky_on_reload=False, reload_on_error=True,
-                    reload_on_success=True, working_directory=Path(filename).parent.absolute())
-                supervisor.reload()
-            elif k == "\x0f":  # Ctrl-O
-
-                supervisor.set_next_code_file("/apps/editor/code.py", sticky_on_reload=False, reload_on_error=True,
-                                              working_directory="/apps/editor")
-                supervisor.reload()
-            elif k == "\x06":  # Ctrl-F
-                find_command = True
-                if last_find == "":
-                    user_prompt = "Find:"
-                else:
-                    user_prompt = f"Find: [{last_find}]"
-            elif k == "\x07":  # Ctrl-G
-                goto_command = True
-                user_prompt = "Goto line:"
-
-            elif k == "KEY_HOME":
-                home(window, buffer, cursor)
-            elif k == "KEY_END":
-                end(window, buffer, cursor)
-            elif k == "KEY_LEFT":
-                left(window, buffer, cursor)
-            elif k == "KEY_DOWN":
-                cursor.down(buffer)
-                window.down(buffer, cursor)
-                window.horizontal_scroll(cursor)
-                #print(f"scroll pos: {window.row}")
-            elif k == "KEY_PGDN":
-                for _ in range(window.n_rows):
-                    cursor.down(buffer)
-                    window.down(buffer, cursor)
-                    window.horizontal_scroll(cursor)
-            elif k == "KEY_UP":
-                cursor.up(buffer)
-                window.up(cursor)
-                window.horizontal_scroll(cursor)
-            elif k == "KEY_PGUP":
-                for _ in range(window.n_rows):
-                    cursor.up(buffer)
-                    window.up(cursor)
-                    window.horizontal_scroll(cursor)
-            elif k == "KEY_RIGHT":
-                right(window, buffer, cursor)
-            elif k == "\n":
-                leading_spaces = _count_leading_characters(buffer.lines[cursor.row], " ")
-                buffer.split(cursor)
-                right(window, buffer, cursor)
-                for i in range(leading_spaces):
-                    buffer.insert(cursor, " ")
-                    right(window, buffer, cursor)
-            elif k in ("KEY_DELETE", "\x04"):
-                print("delete")
-                if cursor.row < len(buffer.lines) - 1 or \
-                        cursor.col < len(buffer.lines[cursor.row]):
-                    buffer.delete(cursor)
-                    # try:
-                    #     visible_cursor.text = buffer.lines[cursor.row][cursor.col]
-                    # except IndexError:
-                    #     visible_cursor.text = " "
-
-            elif k in ("KEY_BACKSPACE", "\x7f", "\x08"):
-                print(f"backspace {bytes(k, 'utf-8')}")
-                if (cursor.row, cursor.col) > (0, 0):
-                    if cursor.col > 0 and buffer.lines[cursor.row][cursor.col-1] == " " and _only_spaces_before(cursor):
-                        for i in range(4):
-                            left(window, buffer, cursor)
-                            buffer.delete(cursor)
-                    else:
-                        left(window, buffer, cursor)
-                        buffer.delete(cursor)
-
             else:
-                print(f"unhandled k: {k}")
-                print(f"unhandled K: {ord(k)}")
-                print(f"unhandled k: {bytes(k, 'utf-8')}")
+                handler = key_handlers.get(k)
+                if handler is None:
+                    print(f"unhandled k: {k}")
+                    print(f"unhandled K: {ord(k)}")
+                    print(f"unhandled k: {bytes(k, 'utf-8')}")
+                elif handler():
+                    return
 
 
         if mouse is not None:
             pressed_btns = mouse.update()
             if pressed_btns is not None and "left" in pressed_btns:
-                clicked_tile_coords[0] = mouse.x // 6
-                clicked_tile_coords[1] = mouse.y // 12
-
-                if clicked_tile_coords[0] > len(buffer.lines[clicked_tile_coords[1]+window.row]):
-                    clicked_tile_coords[0] = len(buffer.lines[clicked_tile_coords[1]+window.row])
-                cursor.row = clicked_tile_coords[1] + window.row
-                cursor.col = clicked_tile_coords[0] + window.col
+                lines = buffer.lines
+                click_row = min(mouse.y // 12 + window.row, len(lines) - 1)
+                cursor.row = click_row
+                cursor.col = min(mouse.x // 6, len(lines[click_row])) + window.col
 
         # print("updating visible cursor")
         # print(f"anchored pos: {((cursor.col * 6) - 1, (cursor.row * 12) + 20)}")
@@ -522,8 +657,8 @@ def editor(stdscr, filename, mouse=None, terminal_tilegrid=None):  # pylint: dis
                 old_cursor_pos[1] - old_window_pos[1] != cursor.row - window.row):
             # print(f"old cursor: {old_cursor_pos}, new: {(cursor.col, cursor.row)}")
             # print(f"window (row,col): {window.row}, {window.col}")
-            terminal_tilegrid.pixel_shader[old_cursor_pos[0] - old_window_pos[0], old_cursor_pos[1] - old_window_pos[1]] = [0,1]
-            terminal_tilegrid.pixel_shader[cursor.col - window.col, cursor.row - window.row] = [1,0]
+            terminal_tilegrid.pixel_shader[old_cursor_pos[0] - old_window_pos[0], old_cursor_pos[1] - old_window_pos[1]] = HL_OFF
+            terminal_tilegrid.pixel_shader[cursor.col - window.col, cursor.row - window.row] = HL_ON
             # print(f"old: {terminal_tilegrid.pixel_shader[old_cursor_pos[0], old_cursor_pos[1]]} new: {terminal_tilegrid.pixel_shader[cursor.col, cursor.row]}")
 
             # visible_cursor.anchored_position = ((cursor.col * 6) - 1, (cursor.row * 12) + 20)
@@ -34,92 +34,94 @@ def has_good_extension(filename):
 
 
 def picker(stdscr, options, notes=(), start_idx=0):
-    stdscr.erase()
-    visible_files = None
-    if len(options) > curses.LINES - 1:
-        visible_files = options[:curses.LINES - 1]
-    else:
-        visible_files = options
-
-    scroll_offset = 0
-    need_to_scroll = False
-
-    # del options[curses.LINES - 1:]
-    print(f"len opts: {len(options)}")
-    print(f"len vis: {len(visible_files)}")
+    drawn_width = 0
 
     def _draw_file_list():
-
-        for row, option in enumerate(visible_files):
-            if row < len(notes) and (note := notes[row]):
+        nonlocal drawn_width
+        labels = []
+        for row in range(n_visible):
+            i = scroll_offset + row
+            option = options[i]
+            if i < len(notes) and (note := notes[i]):
                 option = f"{option} {note}"
-            try:
-                space_count = max(len(visible_files[row + 1]), len(visible_files[row - 1])) - len(option)
-                if space_count < 0:
-                    space_count = 0
-            except IndexError:
-                space_count = curses.COLS - len(option)
-            stdscr.addstr(row, 3, option + " " * space_count)
+            labels.append(option)
+
+        # pad every row to the widest label drawn now or last time, so a name
+        # that scrolled out of a row leaves nothing behind
+        width = max(drawn_width, max((len(label) for label in labels), default=0))
+        for row, label in enumerate(labels):
+            stdscr.addstr(row, 3, label + " " * (width - len(label)))
+        drawn_width = width
         stdscr.addstr(curses.LINES - 1, 0, "Enter: select | ^C: quit | ^N: New")
 
-    _draw_file_list()
-
-    old_idx = None
-    idx = start_idx
+    # entering a directory reloads the listing here rather than recursing
     while True:
+        stdscr.erase()
+        drawn_width = 0
+        # rows are read straight out of options at scroll_offset; scrolling
+        # never changes how many of them fit on screen
+        n_visible = min(len(options), curses.LINES - 1)
+        scroll_offset = 0
+        need_to_scroll = False
+
+        # del options[curses.LINES - 1:]
+        print(f"len opts: {len(options)}")
+        print(f"len vis: {n_visible}")
+
+        _draw_file_list()
+
+        old_idx = None
+        idx = start_idx
+        while True:
+
+            if need_to_scroll:
+                need_to_scroll = False
+                _draw_file_list()
+
+            if idx != old_idx:
+                if old_idx is not None:
+                    stdscr.addstr(old_idx, 0, "  ")
+                stdscr.addstr(idx, 0, "=>")
+                old_idx = idx
+
+            k = stdscr.getkey()
+
+            if k == "KEY_DOWN":
+                print(f"{scroll_offset + n_visible} < {len(options)}")
+                if scroll_offset + n_visible < len(options):
+                    if idx == n_visible - 1:
+                        need_to_scroll = True
+                        scroll_offset += 1
+                idx = min(idx + 1, n_visible - 1)
+
+            elif k == "KEY_UP":
+                if scroll_offset > 0:
+                    if idx == 0:
+                        need_to_scroll = True
+                        scroll_offset -= 1
+                idx = max(idx - 1, 0)
+            elif k == "\n":
+                selected = options[scroll_offset + idx]
+                if selected == "../" or isdir(selected):
+                    os.chdir(selected)
+                    options, notes = _files_list()
+                    start_idx = 0
+                    break
+                else:
+                    return selected
 
-        if need_to_scroll:
-            need_to_scroll = False
-            _draw_file_list()
-
-        if idx != old_idx:
-            if old_idx is not None:
-                stdscr.addstr(old_idx, 0, "  ")
-            stdscr.addstr(idx, 0, "=>")
-            old_idx = idx
 
-        k = stdscr.getkey()
-
-        if k == "KEY_DOWN":
-            print(f"{scroll_offset + len(visible_files)} < {len(options)}")
-            if scroll_offset + len(visible_files) < len(options):
-                if idx == len(visible_files) - 1:
-                    need_to_scroll = True
-                    scroll_offset += 1
-                    visible_files = options[scroll_offset:scroll_offset + curses.LINES - 1]
-            idx = min(idx + 1, len(visible_files) - 1)
-
-        elif k == "KEY_UP":
-            if scroll_offset > 0:
-                if idx == 0:
-                    need_to_scroll = True
-                    scroll_offset -= 1
-                    visible_files = options[scroll_offset:scroll_offset + curses.LINES - 1]
-            idx = max(idx - 1, 0)
-        elif k == "\n":
-            if visible_files[idx] == "../":
-                os.chdir("../")
-                options, notes = _files_list()
-                return picker(stdscr, options, notes)
-            elif isdir(visible_files[idx]):
-                os.chdir(visible_files[idx])
-                options, notes = _files_list()
-                return picker(stdscr, options, notes)
-            else:
-                return visible_files[idx]
-
-
-        # ctrl-N
-        elif k == "\x0E":
-            # if not util.readonly():
-                new_file_name = new_file(stdscr)
-                if new_file_name is not None:
-                    return new_file_name
-                else:
-                    time.sleep(2)
-                    stdscr.erase()
-                    old_idx = None
-                    _draw_file_list()
+            # ctrl-N
+            elif k == "\x0E":
+                # if not util.readonly():
+                    new_file_name = new_file(stdscr)
+                    if new_file_name is not None:
+                        return new_file_name
+                    else:
+                        time.sleep(2)
+                        stdscr.erase()
+                        old_idx = None
+                        _draw_file_list()
 
 
 
@@ -127,15 +129,24 @@ def terminal_input(stdscr, message):
     stdscr.erase()
     stdscr.addstr(0, 0, message)
     input_str_list = []
+    # keys are only echoed once getkey() times out, so a burst of typing or
+    # a paste is drawn with one write instead of one per character
+    drawn = 0
+    dirty_from = 0
     k = stdscr.getkey()
     while k != "\n":
-        if k is not None:
-            if len(k) == 1 and " " <= k <= "~":
-                input_str_list.append(k)
-                stdscr.addstr(0, len(message) + len(input_str_list) - 1, k)
-            elif k == "\x08":
-                input_str_list.pop(len(input_str_list) - 1)
-                stdscr.addstr(0, len(message) + len(input_str_list) - 1, k)
+        if k is None:
+            if dirty_from < max(drawn, len(input_str_list)):
+                tail = "".join(input_str_list[dirty_from:])
+                stdscr.addstr(0, len(message) + dirty_from, tail + " " * (drawn - len(input_str_list)))
+                drawn = dirty_from = len(input_str_list)
+                stdscr.move(0, len(message) + drawn)
+        elif len(k) == 1 and " " <= k <= "~":
+            input_str_list.append(k)
+        elif k == "\x08":
+            if input_str_list:
+                input_str_list.pop()
+                dirty_from = min(dirty_from, len(input_str_list))
         k = stdscr.getkey()
     # submit after enter pressed
     return "".join(input_str_list)
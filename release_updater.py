@@ -2,33 +2,172 @@ import hashlib
 import json
 import os
 import re
-import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from urllib.request import urlretrieve
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
+from build import LEARN_PROJECT_PATHS
 from build import main as build_main
 
-
-def get_file_sha256(file_path):
-    """Calculates the SHA256 hash of a file.
+# concurrent asset downloads
+MAX_WORKERS = 8
+
+# hashes only detect changed zips, so use the fastest hashlib digest
+# rather than a cryptographic-strength one
+DIGEST = "blake2b"
+
+# release tags, e.g. 1.2.3
+SEMVER_RE = re.compile(r"^(\d+)\.(\d+)\.(\d+)(?:-.*)?(?:\+.*)?$")
+
+# ETag-validated API responses, plus the build inputs of the last check
+# that needed no release
+CACHE_FILE = Path(".release_updater_cache.json")
+
+# local files that build.py packs into the release zips
+SOURCE_PATHS = ["build.py", "mock_boot_out.txt", "src", "builtin_apps", "fonts"]
+
+# outside inputs that build.py pulls in: the learn guide apps and the
+# library bundles circup installs from
+LEARN_REPO_TREES_URL = (
+    "https://api.github.com/repos/adafruit/Adafruit_Learning_System_Guides/git/trees"
+)
+LEARN_REPO_BRANCH = "main"
+LIBRARY_BUNDLE_REPOS = [
+    "adafruit/Adafruit_CircuitPython_Bundle",
+    "adafruit/CircuitPython_Community_Bundle",
+    "circuitpython/CircuitPython_Org_Bundle",
+]
+
+# one keep-alive session for every GitHub call, so each request after the
+# first skips the TLS handshake; idempotent requests retry transient 5xx
+SESSION = requests.Session()
+SESSION.headers["Accept"] = "application/vnd.github.v3+json"
+if os.getenv("GITHUB_TOKEN"):
+    SESSION.headers["Authorization"] = f"token {os.getenv('GITHUB_TOKEN')}"
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=MAX_WORKERS,
+        pool_maxsize=MAX_WORKERS,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+    ),
+)
+
+
+def hash_bytes(data):
+    """Calculates the DIGEST hash of a bytes-like object.
 
     Args:
-        file_path: The path to the file.
+        data: The bytes to hash.
 
     Returns:
-        The SHA256 hash of the file as a hexadecimal string.
+        The hash as a hexadecimal string.
+    """
+    return hashlib.new(DIGEST, data).hexdigest()
+
+
+def hash_remote(session, url):
+    """Hash the file at url as it streams in, without saving it.
+
+    :return: The hash of the remote file as a hexadecimal string.
+    """
+    file_hash = hashlib.new(DIGEST)
+    with session.get(url, stream=True) as response:
+        response.raise_for_status()
+        # raw bytes, exactly as they would have been saved to disk
+        for chunk in response.raw.stream(1 << 20, decode_content=False):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def get_src_tree_hash():
+    """Hash the names and contents of every file in SOURCE_PATHS."""
+    tree_hash = hashlib.new(DIGEST)
+    for source_name in SOURCE_PATHS:
+        source_path = Path(source_name)
+        files = [source_path] if source_path.is_file() else sorted(source_path.rglob("*"))
+        for file_path in files:
+            if file_path.is_file():
+                tree_hash.update(file_path.as_posix().encode("utf-8") + b"\0")
+                tree_hash.update(file_path.read_bytes())
+    return tree_hash.hexdigest()
+
+
+def cached_get(session, url, cache, headers=None):
+    """GET a JSON API url, revalidating any cached copy with its ETag.
+
+    GitHub answers an unchanged resource with 304 Not Modified, which skips
+    the body and does not count against the rate limit.
+
+    :return: The decoded JSON body.
+    """
+    responses = cache.setdefault("responses", {})
+    cached = responses.get(url)
+    headers = dict(headers or {})
+    if cached:
+        headers["If-None-Match"] = cached["etag"]
+    response = session.get(url, headers=headers)
+    if response.status_code == 304 and cached:
+        return cached["body"]
+    response.raise_for_status()
+    body = response.json()
+    if etag := response.headers.get("ETag"):
+        responses[url] = {"etag": etag, "body": body}
+    return body
+
+
+def get_learn_project_trees(session, cache):
+    """Look up the git tree SHA of every learn guide folder build.py copies.
+
+    A folder's tree SHA only changes when something inside it does, so
+    commits elsewhere in the learn guide repo do not count as a new input.
+    One trees API call covers all the projects under the same parent.
     """
-    sha256_hash = hashlib.sha256()
+    parents = {}
+    for learn_app_path, _ in LEARN_PROJECT_PATHS:
+        parent, _, name = learn_app_path.rstrip("/").rpartition("/")
+        parents.setdefault(parent, []).append(name)
+    project_trees = {}
+    for parent, names in parents.items():
+        tree_url = f"{LEARN_REPO_TREES_URL}/{LEARN_REPO_BRANCH}:{parent}"
+        tree = cached_get(session, tree_url, cache)
+        tree_shas = {entry["path"]: entry["sha"] for entry in tree["tree"]}
+        for name in names:
+            project_trees[f"{parent}/{name}"] = tree_shas.get(name)
+    return project_trees
+
+
+def get_build_inputs(session, latest_release_obj, cache):
+    """Collect everything a local build depends on, without building."""
+    library_bundles = {}
+    for repo in LIBRARY_BUNDLE_REPOS:
+        bundle_url = f"https://api.github.com/repos/{repo}/releases/latest"
+        bundle_release = cached_get(session, bundle_url, cache)
+        library_bundles[repo] = bundle_release["tag_name"]
+    return {
+        "digest": DIGEST,
+        "last_checked_tag": latest_release_obj["tag_name"],
+        "src_tree_hash": get_src_tree_hash(),
+        "learn_project_trees": get_learn_project_trees(session, cache),
+        "library_bundles": library_bundles,
+    }
+
+
+def load_cache():
     try:
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(chunk)
-    except FileNotFoundError:
-        return "File not found."
-    return sha256_hash.hexdigest()
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_cache(cache):
+    with open(CACHE_FILE, "w") as f:
+        json.dump(cache, f, indent=2)
 
 
 def print_hashes(hash_dict):
@@ -44,34 +183,54 @@ def is_release_required():
     :return: True if there are new versions of any apps, and release is required, False otherwise.
     """
 
-    try:
-        dl_dir = Path("latest_dl")
-        if dl_dir.exists():
-            shutil.rmtree("latest_dl")
-        dl_dir.mkdir()
-    except FileExistsError:
-        pass
-
-    # download built zips from most recent release
-    RELEASE_API_URL = "https://api.github.com/repos/adafruit/Fruit-Jam-OS/releases?per_page=1"
-    latest_release_obj = requests.get(RELEASE_API_URL).json()[0]
-    for asset in latest_release_obj["assets"]:
-        asset_dl_url = asset["browser_download_url"]
-        asset_filename = asset_dl_url.split("/")[-1]
-        urlretrieve(asset_dl_url, f"latest_dl/{asset_filename}")
-
-    # get sha256 hashes for each downloaded zip
-    downloaded_file_hashes = {}
-    for dl_file in Path("latest_dl").iterdir():
-        downloaded_file_hashes[dl_file.name] = get_file_sha256(dl_file)
-
-    # make a local build
-    build_main()
-
-    # get sha256 hashes for built zips
-    dist_file_hashes = {}
-    for dist_file in Path("dist").iterdir():
-        dist_file_hashes[dist_file.name] = get_file_sha256(dist_file)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        # download built zips from most recent release
+        RELEASE_API_URL = "https://api.github.com/repos/adafruit/Fruit-Jam-OS/releases?per_page=1"
+        cache = load_cache()
+        latest_release_obj = cached_get(SESSION, RELEASE_API_URL, cache)[0]
+
+        # skip the download and build when nothing feeding them has changed
+        # since a check that found the release up to date
+        build_inputs = get_build_inputs(SESSION, latest_release_obj, cache)
+        if cache.get("build_inputs") == build_inputs:
+            print("Release and build inputs unchanged since last check, no release required.")
+            save_cache(cache)
+            return False
+
+        # make a local build, hashing each zip as it is built
+        dist_file_hashes = build_main(hash_func=hash_bytes)
+
+        # zips whose names or sizes differ cannot match, so only download
+        # and hash anything when both line up
+        remote_sizes = {
+            asset["browser_download_url"].split("/")[-1]: asset["size"]
+            for asset in latest_release_obj["assets"]
+        }
+        local_sizes = {
+            dist_file.name: dist_file.stat().st_size for dist_file in Path("dist").iterdir()
+        }
+        if local_sizes != remote_sizes:
+            print("Zip names or sizes differ, a release is required.")
+            cache.pop("build_inputs", None)
+            save_cache(cache)
+            return True
+
+        # hash the released zips as they stream in from GitHub, stopping at
+        # the first one that differs from its local build
+        futures = {}
+        for asset in latest_release_obj["assets"]:
+            asset_dl_url = asset["browser_download_url"]
+            futures[pool.submit(hash_remote, SESSION, asset_dl_url)] = asset_dl_url.split("/")[-1]
+        downloaded_file_hashes = {}
+        for future in as_completed(futures):
+            asset_filename = futures[future]
+            downloaded_file_hashes[asset_filename] = future.result()
+            if downloaded_file_hashes[asset_filename] != dist_file_hashes.get(asset_filename):
+                print(f"{asset_filename} hash differs, a release is required.")
+                pool.shutdown(cancel_futures=True)
+                cache.pop("build_inputs", None)
+                save_cache(cache)
+                return True
 
     print("Downloaded file hashes:")
     print_hashes(downloaded_file_hashes)
@@ -79,12 +238,9 @@ def is_release_required():
     print("Dist file hashes:")
     print_hashes(dist_file_hashes)
 
-    # compare hashes
-    if dist_file_hashes != downloaded_file_hashes:
-        print("Zip hashes differ, a release is required.")
-        return True
-
     print("Zip hashes match, no release required.")
+    cache["build_inputs"] = build_inputs
+    save_cache(cache)
     return False
 
 
@@ -92,7 +248,7 @@ def parse_semantic_version(version_string):
     """Parse semantic version string and return (major, minor, patch)."""
 
     # Match semantic version pattern
-    match = re.match(r"^(\d+)\.(\d+)\.(\d+)(?:-.*)?(?:\+.*)?$", version_string)
+    match = SEMVER_RE.match(version_string)
     if not match:
         raise ValueError(f"Invalid semantic version: {version_string}")
 
@@ -109,30 +265,21 @@ def increment_patch_version(version_string):
 def get_latest_release():
     """Fetch the latest release from GitHub API."""
     url = f"https://api.github.com/repos/adafruit/Fruit-Jam-OS/releases/latest"
-    headers = {
-        "Authorization": f"token {os.getenv('GITHUB_TOKEN')}",
-        "Accept": "application/vnd.github.v3+json",
-    }
-
-    response = requests.get(url, headers=headers)
-
-    if response.status_code != 200:
-        print(f"Error fetching latest release: {response.status_code}")
-        print(f"Response: {response.text}")
+    cache = load_cache()
+    try:
+        latest_release = cached_get(SESSION, url, cache)
+    except requests.HTTPError as e:
+        print(f"Error fetching latest release: {e.response.status_code}")
+        print(f"Response: {e.response.text}")
         sys.exit(1)
+    save_cache(cache)
 
-    return response.json()
+    return latest_release
 
 
 def create_release(tag_name):
     """Create a new GitHub release."""
     url = f"https://api.github.com/repos/adafruit/Fruit-Jam-OS/releases"
-    headers = {
-        "Authorization": f"token {os.getenv('GITHUB_TOKEN')}",
-        "Accept": "application/vnd.github.v3+json",
-        "Content-Type": "application/json",
-    }
-
     data = {
         "tag_name": tag_name,
         "name": tag_name,
@@ -141,7 +288,7 @@ def create_release(tag_name):
         "prerelease": False,
     }
 
-    response = requests.post(url, headers=headers, data=json.dumps(data))
+    response = SESSION.post(url, json=data)
 
     if response.status_code != 201:
         print(f"Error creating release: {response.status_code}")
@@ -151,6 +298,16 @@ def create_release(tag_name):
     return response.json()
 
 
+def write_github_output(**outputs):
+    """Append key=value step outputs for GitHub Actions, if running there."""
+    github_output_path = os.environ.get("GITHUB_OUTPUT")
+
+    if github_output_path:
+        with open(github_output_path, "a") as f:
+            for key, value in outputs.items():
+                f.write(f"{key}={value}\n")
+
+
 if __name__ == "__main__":
     if is_release_required():
         if len(sys.argv) > 1 and sys.argv[1] == "make_release":
@@ -179,19 +336,9 @@ if __name__ == "__main__":
 
             # print(new_release)
 
-            github_output_path = os.environ.get("GITHUB_OUTPUT")
-
-            if github_output_path:
-                with open(github_output_path, "a") as f:
-                    f.write(f"release_created=true\n")
-                    f.write(f"assets_upload_url={new_release['upload_url']}\n")
+            write_github_output(release_created="true", assets_upload_url=new_release["upload_url"])
 
             print(f"Successfully created release: {new_tag}")
             print(f"Release URL: {new_release['html_url']}")
     else:
-        github_output_path = os.environ.get("GITHUB_OUTPUT")
-
-        if github_output_path:
-            with open(github_output_path, "a") as f:
-                f.write(f"release_created=false\n")
-                f.write(f"assets_upload_url=None\n")
+        write_github_output(release_created="false", assets_upload_url="None")
@@ -1,10 +1,8 @@
 # SPDX-FileCopyrightText: 2025 Tim Cocks for Adafruit Industries
 # SPDX-License-Identifier: MIT
 
-import adafruit_pathlib as pathlib
-import storage
 import supervisor
-from adafruit_argv_file import read_argv, write_argv
+from adafruit_argv_file import read_argv
 
 supervisor.runtime.autoreload = False
 
@@ -21,6 +19,9 @@ boot.py arguments
 
 args = read_argv(__file__)
 if args is not None and len(args) > 0:
+    import storage
+    from adafruit_argv_file import write_argv
+
     readonly = args[0]
     next_code_file = None
     remaining_args = None
@@ -33,14 +34,13 @@ if args is not None and len(args) > 0:
     if remaining_args is not None:
         write_argv(next_code_file, remaining_args)
 
-    # print(f"setting storage readonly to: {readonly}")
     storage.remount("/", readonly=readonly)
 
     supervisor.set_next_code_file(
         next_code_file,
         sticky_on_reload=False,
         reload_on_error=True,
-        working_directory="/".join(next_code_file.split("/")[:-1]),
+        working_directory=next_code_file[: max(next_code_file.rfind("/"), 0)],
     )
 
 elif supervisor.runtime.display is None:
@@ -1,16 +1,18 @@
 # SPDX-FileCopyrightText: 2025 Tim Cocks for Adafruit Industries
 #
 # SPDX-License-Identifier: MIT
-import json
+import gc
 import math
 import time
 
 import adafruit_fruitjam
 import adafruit_imageload
+import audiocore
 import board
 import supervisor
 from displayio import Group, TileGrid
 from launcher_config import LauncherConfig
+from ticks import ticks_diff
 
 launcher_config = LauncherConfig()
 
@@ -24,10 +26,15 @@ i2c = board.I2C()
 # Check if DAC is connected
 while not i2c.try_lock():
     time.sleep(0.01)
-if 0x18 in i2c.scan():
-    tlv320_present = True
+# Address the DAC directly rather than scanning the whole bus for it
+if hasattr(i2c, "probe"):
+    tlv320_present = i2c.probe(0x18)
 else:
-    tlv320_present = False
+    try:
+        i2c.writeto(0x18, b"")
+        tlv320_present = True
+    except OSError:
+        tlv320_present = False
 i2c.unlock()
 
 if tlv320_present:
@@ -42,7 +49,35 @@ if tlv320_present:
 
     fjPeriphs.volume = volume_level
 
-    wave_file = "/boot_animation_assets/ada_fruitjam_boot_jingle.wav"
+    # Open and parse the jingle now so starting it alongside the animation
+    # doesn't wait on the filesystem
+    boot_jingle = audiocore.WaveFile("/boot_animation_assets/ada_fruitjam_boot_jingle.wav")
+
+# x ** 1.2 sampled across [0, 1], so the overshoot ease-in can interpolate
+# instead of calling pow() every frame
+_EASE_IN_STEPS = 64
+_EASE_IN_LUT = tuple((i / _EASE_IN_STEPS) ** 1.2 for i in range(_EASE_IN_STEPS + 1))
+# maps progress through the first 70% of an overshoot animation onto the LUT
+_EASE_IN_SCALE = _EASE_IN_STEPS / 0.7
+# maps progress through the last 30% (overshoot back to target) onto [0, 1]
+_RETURN_SCALE = 1 / 0.3
+
+
+def overshoot_point(start_x, start_y, target_x, target_y, overshoot_pixels):
+    """The point overshoot_pixels past the target, along the start -> target direction."""
+    dx = target_x - start_x
+    dy = target_y - start_y
+    # Without overshoot the distance is never needed
+    if overshoot_pixels <= 0 or (dx == 0 and dy == 0):
+        return target_x, target_y
+    # Straight horizontal or vertical flights just step past the target on
+    # their one axis; the general path below still handles diagonals
+    if dx == 0:
+        return target_x, target_y + (overshoot_pixels if dy > 0 else -overshoot_pixels)
+    if dy == 0:
+        return target_x + (overshoot_pixels if dx > 0 else -overshoot_pixels), target_y
+    overshoot_scale = overshoot_pixels / math.sqrt(dx * dx + dy * dy)
+    return target_x + dx * overshoot_scale, target_y + dy * overshoot_scale
 
 
 class OvershootAnimator:
@@ -61,6 +96,8 @@ class OvershootAnimator:
         - element: An object with x and y properties that will be animated
         """
         self.element = element
+        # set whenever tick() changes the element, cleared by whoever refreshes
+        self.dirty = False
         self.pos_animating = False
         self.start_time = 0
         self.start_x = 0
@@ -70,12 +107,21 @@ class OvershootAnimator:
         self.overshoot_x = 0
         self.overshoot_y = 0
         self.duration = 0
+        self.inv_duration = 0
+        self.dx_to_overshoot = 0
+        self.dy_to_overshoot = 0
+        self.dx_from_overshoot = 0
+        self.dy_from_overshoot = 0
+        self.dx_to_target = 0
+        self.dy_to_target = 0
         self.overshoot_pixels = 0
         self.eased_value = None
+        self.inv_eased_value = None
 
         self.cur_sprite_index = None
-        self.last_sprite_frame_time = -1
-        self.sprite_anim_start_time = -1
+        # the sprite frame the element is showing, to skip rewriting it
+        self.shown_sprite_index = element[0] if isinstance(element, TileGrid) else None
+        self.sprite_anim_start_time = None
         self.sprite_anim_from_index = None
         self.sprite_anim_to_index = None
         self.sprite_anim_delay = None
@@ -84,24 +130,30 @@ class OvershootAnimator:
         self,
         target_x,
         target_y,
-        duration=1.0,
+        duration=1000,
         overshoot_pixels=20,
         start_sprite_anim_at=None,
-        sprite_delay=1 / 60,
+        sprite_delay=round(1000 / 60),
         sprite_from_index=None,
         sprite_to_index=None,
         eased_value=None,
+        overshoot_loc=None,
+        now=None,
     ):
         """
         Start a new animation to the specified target.
 
         Parameters:
         - target_x, target_y: The final target coordinates
-        - duration: Total animation time in seconds
+        - duration: Total animation time in milliseconds
         - overshoot_pixels: How many pixels to overshoot beyond the target
                             (use 0 for no overshoot)
+        - overshoot_loc: The overshoot point, if already known from
+                         overshoot_point() for the element's current position
+        - now: The start time in ticks_ms(); pass the caller's frame time so the
+               first tick() never sees a negative elapsed time
         """
-        _now = time.monotonic()
+        _now = supervisor.ticks_ms() if now is None else now
 
         # Record starting position and time
         self.start_x = self.element.x
@@ -118,115 +170,148 @@ class OvershootAnimator:
         self.target_x = target_x
         self.target_y = target_y
         self.duration = duration
+        self.inv_duration = 1 / duration
         self.overshoot_pixels = overshoot_pixels
 
         # Calculate distance to target
         dx = target_x - self.start_x
         dy = target_y - self.start_y
+        self.dx_to_target = dx
+        self.dy_to_target = dy
 
-        # Calculate the direction vector (normalized)
-        distance = math.sqrt(dx * dx + dy * dy)
-        if distance <= 0:
+        if dx == 0 and dy == 0:
             # Already at target
             return False
 
-        dir_x = dx / distance
-        dir_y = dy / distance
-
         # Calculate overshoot position
-        self.overshoot_x = target_x + dir_x * overshoot_pixels
-        self.overshoot_y = target_y + dir_y * overshoot_pixels
+        if overshoot_loc is None:
+            overshoot_loc = overshoot_point(
+                self.start_x, self.start_y, target_x, target_y, overshoot_pixels
+            )
+        self.overshoot_x, self.overshoot_y = overshoot_loc
 
         self.eased_value = eased_value
+        self.inv_eased_value = None if eased_value is None else 1 / eased_value
+
+        # Precompute the per-phase deltas so tick() only has to scale them
+        self.dx_to_overshoot = self.overshoot_x - self.start_x
+        self.dy_to_overshoot = self.overshoot_y - self.start_y
+        self.dx_from_overshoot = target_x - self.overshoot_x
+        self.dy_from_overshoot = target_y - self.overshoot_y
 
         # Start the animation
         self.pos_animating = True
         return True
 
     def sprite_anim_tick(self, cur_time):
-        if cur_time >= self.last_sprite_frame_time + self.sprite_anim_delay:
-            self.element[0] = self.cur_sprite_index
-            self.last_sprite_frame_time = cur_time
-            self.cur_sprite_index += 1
-
-            if self.cur_sprite_index > self.sprite_anim_to_index:
-                self.cur_sprite_index = None
-                self.sprite_anim_from_index = None
-                self.sprite_anim_to_index = None
-                self.sprite_anim_delay = None
-                self.last_sprite_frame_time = -1
-                self.sprite_anim_start_time = -1
-                return False
+        to_index = self.sprite_anim_to_index
+        # Show whichever frame is due by now, so a late tick catches up
+        # instead of stretching out the rest of the sprite animation
+        sprite_index = min(
+            self.sprite_anim_from_index
+            + ticks_diff(cur_time, self.sprite_anim_start_time) // self.sprite_anim_delay,
+            to_index,
+        )
+
+        if sprite_index != self.shown_sprite_index:
+            self.element[0] = sprite_index
+            self.shown_sprite_index = sprite_index
+            self.dirty = True
+        self.cur_sprite_index = sprite_index
+
+        if sprite_index == to_index:
+            self.cur_sprite_index = None
+            self.sprite_anim_from_index = None
+            self.sprite_anim_to_index = None
+            self.sprite_anim_delay = None
+            self.sprite_anim_start_time = None
+            return False
 
         return True
 
-    def tick(self):
+    def tick(self, now=None):
         """
         Update the animation based on the current time.
 
         This method should be called repeatedly until it returns False.
 
+        Parameters:
+        - now: The current supervisor.ticks_ms() value, so a loop driving
+               several animators can read the clock once per frame. Read
+               here when omitted.
+
         Returns:
-        - True if the animation is still in progress
-        - False if the animation has completed
+        - True while the element is still moving or sprite frames remain
+        - False once both have finished
         """
-        still_sprite_animating = False
-        _now = time.monotonic()
-        if self.cur_sprite_index is not None:
-            if _now >= self.sprite_anim_start_time:
-                still_sprite_animating = self.sprite_anim_tick(_now)
-                # print("sprite_still_animating", still_sprite_animating)
-                if not still_sprite_animating:
-                    return False
-        elif not self.pos_animating:
-            # print("returning false cur_sprite_index was None and pos_animating False")
+        # CircuitPython has no native code emitter for the per-frame math, so
+        # attributes and globals read more than once are bound to locals
+        sprite_animating = self.cur_sprite_index is not None
+        if not sprite_animating and not self.pos_animating:
             return False
 
+        element = self.element
+        if now is None:
+            now = supervisor.ticks_ms()
+        if sprite_animating and ticks_diff(now, self.sprite_anim_start_time) >= 0:
+            sprite_animating = self.sprite_anim_tick(now)
+        if not self.pos_animating:
+            return sprite_animating
+
         # Calculate elapsed time and progress
-        elapsed = _now - self.start_time
-        progress = elapsed / self.duration
+        elapsed = ticks_diff(now, self.start_time)
+        progress = elapsed * self.inv_duration
 
         # Check if animation is complete
         if progress >= 1.0:
             # Ensure we end exactly at the target
-            if self.element.x != self.target_x or self.element.y != self.target_y:
-                self.element.x = self.target_x
-                self.element.y = self.target_y
+            if element.x != self.target_x or element.y != self.target_y:
+                element.x = self.target_x
+                element.y = self.target_y
+                self.dirty = True
 
             self.pos_animating = False
-            if still_sprite_animating:
-                return True
-            else:
-                return False
+            return sprite_animating
 
         # Calculate the current position based on progress
         if self.overshoot_pixels > 0:
             # Two-phase animation with overshoot
             if progress < 0.7:  # Move smoothly toward overshoot position
-                # Use a single smooth curve to the overshoot point
-                eased = progress / 0.7  # Linear acceleration toward overshoot
-                # Apply slight ease-in to make it accelerate through the target point
-                eased = eased**1.2
-                current_x = self.start_x + (self.overshoot_x - self.start_x) * eased
-                current_y = self.start_y + (self.overshoot_y - self.start_y) * eased
+                # Use a single smooth curve to the overshoot point, with a slight
+                # ease-in to make it accelerate through the target point
+                ease_lut = _EASE_IN_LUT
+                lut_pos = progress * _EASE_IN_SCALE
+                lut_index = int(lut_pos)
+                eased = ease_lut[lut_index]
+                eased += (ease_lut[lut_index + 1] - eased) * (lut_pos - lut_index)
+                current_x = self.start_x + self.dx_to_overshoot * eased
+                current_y = self.start_y + self.dy_to_overshoot * eased
             else:  # Return from overshoot to target
-                sub_progress = (progress - 0.7) / 0.3
+                remaining = 1 - (progress - 0.7) * _RETURN_SCALE
                 # Decelerate toward final target
-                eased = 1 - (1 - sub_progress) ** 2  # ease-out quad
-                current_x = self.overshoot_x + (self.target_x - self.overshoot_x) * eased
-                current_y = self.overshoot_y + (self.target_y - self.overshoot_y) * eased
+                eased = 1 - remaining * remaining  # ease-out quad
+                current_x = self.overshoot_x + self.dx_from_overshoot * eased
+                current_y = self.overshoot_y + self.dy_from_overshoot * eased
         else:
             # Simple ease-out when no overshoot is desired
-            if self.eased_value is None:
-                eased = 1 - (1 - progress) ** 4
+            if self.inv_eased_value is None:
+                remaining = 1 - progress
+                remaining *= remaining
+                eased = 1 - remaining * remaining  # ease-out quart
             else:
-                eased = progress / self.eased_value
-            current_x = self.start_x + (self.target_x - self.start_x) * eased
-            current_y = self.start_y + (self.target_y - self.start_y) * eased
-
-        # Update element position
-        self.element.x = int(current_x)
-        self.element.y = int(current_y)
+                eased = progress * self.inv_eased_value
+            current_x = self.start_x + self.dx_to_target * eased
+            current_y = self.start_y + self.dy_to_target * eased
+
+        # Update element position, skipping writes that would not move it
+        new_x = int(current_x)
+        new_y = int(current_y)
+        if element.x != new_x:
+            element.x = new_x
+            self.dirty = True
+        if element.y != new_y:
+            element.y = new_y
+            self.dirty = True
 
         return True
 
@@ -239,22 +324,47 @@ class OvershootAnimator:
         self.pos_animating = False
 
 
-apple_sprites, apple_sprites_palette = adafruit_imageload.load(
+# letter, sprite width for each of the FRUIT and JAM sprite sheets
+LETTER_SHEETS = (
+    ("f", 32),
+    ("r", 32),
+    ("u", 32),
+    ("i", 16),
+    ("t", 32),
+    ("j", 32),
+    ("a", 32),
+    ("m", 43),
+)
+
+# The apple and FRUIT sheets all use the same two colors, and the JAM sheets
+# the same three with index 0 transparent, so each set shares one palette and
+# the palettes that load with the other sheets are dropped.
+apple_sprites, fruit_sprites_palette = adafruit_imageload.load(
     "/boot_animation_assets/apple_spritesheet.bmp"
 )
-f_sprites, f_sprites_palette = adafruit_imageload.load("/boot_animation_assets/f_spritesheet.bmp")
-r_sprites, r_sprites_palette = adafruit_imageload.load("/boot_animation_assets/r_spritesheet.bmp")
-u_sprites, u_sprites_palette = adafruit_imageload.load("/boot_animation_assets/u_spritesheet.bmp")
-i_sprites, i_sprites_palette = adafruit_imageload.load("/boot_animation_assets/i_spritesheet.bmp")
-t_sprites, t_sprites_palette = adafruit_imageload.load("/boot_animation_assets/t_spritesheet.bmp")
-j_sprites, j_sprites_palette = adafruit_imageload.load("/boot_animation_assets/j_spritesheet.bmp")
-j_sprites_palette.make_transparent(0)
-a_sprites, a_sprites_palette = adafruit_imageload.load("/boot_animation_assets/a_spritesheet.bmp")
-a_sprites_palette.make_transparent(0)
-m_sprites, m_sprites_palette = adafruit_imageload.load("/boot_animation_assets/m_spritesheet.bmp")
-m_sprites_palette.make_transparent(0)
-
-default_sprite_delay = 1 / 35
+jam_sprites_palette = None
+letter_tilegrids = {}
+for letter, tile_width in LETTER_SHEETS:
+    sprites, sprites_palette = adafruit_imageload.load(
+        f"/boot_animation_assets/{letter}_spritesheet.bmp"
+    )
+    if letter in "jam":
+        if jam_sprites_palette is None:
+            sprites_palette.make_transparent(0)
+            jam_sprites_palette = sprites_palette
+        sprites_palette = jam_sprites_palette
+    else:
+        sprites_palette = fruit_sprites_palette
+    letter_tilegrids[letter] = TileGrid(
+        sprites,
+        pixel_shader=sprites_palette,
+        tile_width=tile_width,
+        tile_height=39,
+        width=1,
+        height=1,
+    )
+
+default_sprite_delay = round(1000 / 35)
 
 main_group = Group()
 main_group.x = display.width // 2 - BOX_SIZE[0] // 2 - 30
@@ -268,36 +378,12 @@ letters_y_start = display.height
 
 apple_tilegrid = TileGrid(
     apple_sprites,
-    pixel_shader=apple_sprites_palette,
+    pixel_shader=fruit_sprites_palette,
     tile_width=73,
     tile_height=107,
     width=1,
     height=1,
 )
-f_tilegrid = TileGrid(
-    f_sprites, pixel_shader=f_sprites_palette, tile_width=32, tile_height=39, width=1, height=1
-)
-r_tilegrid = TileGrid(
-    r_sprites, pixel_shader=r_sprites_palette, tile_width=32, tile_height=39, width=1, height=1
-)
-u_tilegrid = TileGrid(
-    u_sprites, pixel_shader=u_sprites_palette, tile_width=32, tile_height=39, width=1, height=1
-)
-i_tilegrid = TileGrid(
-    i_sprites, pixel_shader=i_sprites_palette, tile_width=16, tile_height=39, width=1, height=1
-)
-t_tilegrid = TileGrid(
-    t_sprites, pixel_shader=t_sprites_palette, tile_width=32, tile_height=39, width=1, height=1
-)
-j_tilegrid = TileGrid(
-    j_sprites, pixel_shader=j_sprites_palette, tile_width=32, tile_height=39, width=1, height=1
-)
-a_tilegrid = TileGrid(
-    a_sprites, pixel_shader=a_sprites_palette, tile_width=32, tile_height=39, width=1, height=1
-)
-m_tilegrid = TileGrid(
-    m_sprites, pixel_shader=m_sprites_palette, tile_width=43, tile_height=39, width=1, height=1
-)
 
 coordinator = {
     "steps": [
@@ -307,44 +393,41 @@ coordinator = {
             "tilegrid": apple_tilegrid,
             "offscreen_loc": (0, -207),
             "onscreen_loc": (0, 21),
-            "move_duration": 0.45,
+            "move_duration": 450,
             "overshoot_pixels": 1,
             "eased_value": None,
             "sprite_anim_range": (0, 11),
-            "sprite_delay": 1 / 42,
-            "start_time": 0.0,
-            "sprite_anim_start": 0.347,
-            "started": False,
+            "sprite_delay": round(1000 / 42),
+            "start_time": 0,
+            "sprite_anim_start": 347,
         },
         # F fly on
         {
             "type": "animation_step",
-            "tilegrid": f_tilegrid,
+            "tilegrid": letter_tilegrids["f"],
             "offscreen_loc": (letters_x_start, letters_y_start),
             "onscreen_loc": (letters_x_start, 67),
-            "move_duration": 0.45,
+            "move_duration": 450,
             "overshoot_pixels": 20,
             "eased_value": None,
             "sprite_anim_range": (0, 15),
             "sprite_delay": default_sprite_delay,
-            "start_time": 0.45,
-            "sprite_anim_start": 0.347,
-            "started": False,
+            "start_time": 450,
+            "sprite_anim_start": 347,
         },
         # R fly on
         {
             "type": "animation_step",
-            "tilegrid": r_tilegrid,
+            "tilegrid": letter_tilegrids["r"],
             "offscreen_loc": (letters_x_start + 32 + 3 - 1, letters_y_start),
             "onscreen_loc": (letters_x_start + 32 + 3 - 1, 67),
-            "move_duration": 0.45,
+            "move_duration": 450,
             "overshoot_pixels": 20,
             "eased_value": None,
             "sprite_anim_range": (0, 15),
             "sprite_delay": default_sprite_delay,
-            "start_time": 0.9,
-            "sprite_anim_start": 0.347,
-            "started": False,
+            "start_time": 900,
+            "sprite_anim_start": 347,
         },
         # Left slide everything
         {
@@ -352,105 +435,98 @@ coordinator = {
             "tilegrid": sliding_group,
             "offscreen_loc": (100, 0),
             "onscreen_loc": (30, 0),
-            "move_duration": 1.75,
+            "move_duration": 1750,
             "overshoot_pixels": 0,
             "eased_value": 1,
             "sprite_anim_range": None,
             "sprite_delay": None,
-            "start_time": 0.9,
+            "start_time": 900,
             "sprite_anim_start": None,
-            "started": False,
         },
         # U fly on
         {
             "type": "animation_step",
-            "tilegrid": u_tilegrid,
+            "tilegrid": letter_tilegrids["u"],
             "offscreen_loc": (letters_x_start + (32 + 3) * 2 - 2, letters_y_start),
             "onscreen_loc": (letters_x_start + (32 + 3) * 2 - 2, 67),
-            "move_duration": 0.45,
+            "move_duration": 450,
             "overshoot_pixels": 20,
             "eased_value": None,
             "sprite_anim_range": (0, 15),
             "sprite_delay": default_sprite_delay,
-            "start_time": 1.35,
-            "sprite_anim_start": 0.347,
-            "started": False,
+            "start_time": 1350,
+            "sprite_anim_start": 347,
         },
         # I fly on
         {
             "type": "animation_step",
-            "tilegrid": i_tilegrid,
+            "tilegrid": letter_tilegrids["i"],
             "offscreen_loc": (letters_x_start + (32 + 3) * 3 - 3, letters_y_start),
             "onscreen_loc": (letters_x_start + (32 + 3) * 3 - 3, 67),
-            "move_duration": 0.45,
+            "move_duration": 450,
             "overshoot_pixels": 20,
             "eased_value": None,
             "sprite_anim_range": (0, 15),
             "sprite_delay": default_sprite_delay,
-            "start_time": 1.8,
-            "sprite_anim_start": 0.347,
-            "started": False,
+            "start_time": 1800,
+            "sprite_anim_start": 347,
         },
         # T fly on
         {
             "type": "animation_step",
-            "tilegrid": t_tilegrid,
+            "tilegrid": letter_tilegrids["t"],
             "offscreen_loc": (letters_x_start + (32 + 3) * 3 + 16 + 3 - 4, letters_y_start),
             "onscreen_loc": (letters_x_start + (32 + 3) * 3 + 16 + 3 - 4, 67),
-            "move_duration": 0.45,
+            "move_duration": 450,
             "overshoot_pixels": 20,
             "eased_value": None,
             "sprite_anim_range": (0, 15),
             "sprite_delay": default_sprite_delay,
-            "start_time": 2.25,
-            "sprite_anim_start": 0.347,
-            "started": False,
+            "start_time": 2250,
+            "sprite_anim_start": 347,
         },
         # J fly on
         {
             "type": "animation_step",
-            "tilegrid": j_tilegrid,
+            "tilegrid": letter_tilegrids["j"],
             "offscreen_loc": (letters_x_start, letters_y_start),
             "onscreen_loc": (letters_x_start, 50 + 39),
-            "move_duration": 0.45,
+            "move_duration": 450,
             "overshoot_pixels": 4,
             "eased_value": None,
             "sprite_anim_range": (0, 15),
             "sprite_delay": default_sprite_delay,
-            "start_time": 2.7,
-            # "sprite_anim_start": 0.347,
-            "sprite_anim_start": 0.4,
-            "started": False,
+            "start_time": 2700,
+            # "sprite_anim_start": 347,
+            "sprite_anim_start": 400,
         },
         # A fly on
         {
             "type": "animation_step",
-            "tilegrid": a_tilegrid,
+            "tilegrid": letter_tilegrids["a"],
             "offscreen_loc": (letters_x_start + 32 + 3 - 1, letters_y_start),
             "onscreen_loc": (letters_x_start + 32 + 3 - 1, 50 + 39),
-            "move_duration": 0.45,
+            "move_duration": 450,
             "overshoot_pixels": 4,
             "eased_value": None,
             "sprite_anim_range": (0, 15),
             "sprite_delay": default_sprite_delay,
-            "start_time": 3.15,
-            "sprite_anim_start": 0.4,
-            "started": False,
+            "start_time": 3150,
+            "sprite_anim_start": 400,
         },
         # M fly on
         {
             "type": "animation_step",
-            "tilegrid": m_tilegrid,
+            "tilegrid": letter_tilegrids["m"],
             "offscreen_loc": (letters_x_start + 32 + 3 + 32 + 2 - 1, letters_y_start),
             "onscreen_loc": (letters_x_start + 32 + 3 + 32 + 2 - 1, 50 + 39),
-            "move_duration": 0.45,
+            "move_duration": 450,
             "overshoot_pixels": 4,
             "eased_value": None,
             "sprite_anim_range": (0, 15),
             "sprite_delay": default_sprite_delay,
-            "start_time": 3.6,
-            "sprite_anim_start": 0.4,
-            "started": False,
+            "start_time": 3600,
+            "sprite_anim_start": 400,
         },
     ]
 }
@@ -463,249 +539,283 @@ for step in coordinator["steps"]:
     step["tilegrid"].y = step["offscreen_loc"][1]
     step["animator"] = OvershootAnimator(step["tilegrid"])
 
+# Bounces and blinks replay an earlier step's animator with new parameters.
+# They only need that animator, and are appended in any order since steps
+# are sorted by start time before the animation runs.
 # F bounce up from J impact
-coordinator["steps"].insert(
-    8,
+coordinator["steps"].append(
     {
         "type": "animation_step",
-        "tilegrid": coordinator["steps"][1]["tilegrid"],
         "animator": coordinator["steps"][1]["animator"],
-        "offscreen_loc": (letters_x_start, letters_y_start),
         "onscreen_loc": (letters_x_start, 52),
-        "move_duration": 0.3,
+        "move_duration": 300,
         "overshoot_pixels": 22,
         "eased_value": None,
         "sprite_anim_range": (19, 27),
-        "sprite_delay": 1 / 22,
-        "start_time": 3.0,
-        "sprite_anim_start": 0.15,
-        "started": False,
+        "sprite_delay": round(1000 / 22),
+        "start_time": 3000,
+        "sprite_anim_start": 150,
     },
 )
 # R bounce up from A impact
-coordinator["steps"].insert(
-    10,
+coordinator["steps"].append(
     {
         "type": "animation_step",
-        "tilegrid": coordinator["steps"][2]["tilegrid"],
         "animator": coordinator["steps"][2]["animator"],
-        "offscreen_loc": (letters_x_start + 32 + 3 - 1, letters_y_start),
         "onscreen_loc": (letters_x_start + 32 + 3 - 1, 52),
-        "move_duration": 0.3,
+        "move_duration": 300,
         "overshoot_pixels": 22,
         "eased_value": None,
         "sprite_anim_range": (19, 27),
-        "sprite_delay": 1 / 22,
-        "start_time": 3.45,
-        "sprite_anim_start": 0.15,
-        "started": False,
+        "sprite_delay": round(1000 / 22),
+        "start_time": 3450,
+        "sprite_anim_start": 150,
     },
 )
 # U bounce up from M impact
 coordinator["steps"].append(
     {
         "type": "animation_step",
-        "tilegrid": coordinator["steps"][4]["tilegrid"],
         "animator": coordinator["steps"][4]["animator"],
-        "offscreen_loc": (letters_x_start + (32 + 3) * 2 - 2, letters_y_start),
         "onscreen_loc": (letters_x_start + (32 + 3) * 2 - 2, 52),
-        "move_duration": 0.3,
+        "move_duration": 300,
         "overshoot_pixels": 22,
         "eased_value": None,
         "sprite_anim_range": (19, 27),
-        "sprite_delay": 1 / 22,
-        "start_time": 3.9,
-        "sprite_anim_start": 0.15,
-        "started": False,
+        "sprite_delay": round(1000 / 22),
+        "start_time": 3900,
+        "sprite_anim_start": 150,
     },
 )
 # I bounce up from M impact
 coordinator["steps"].append(
     {
         "type": "animation_step",
-        "tilegrid": coordinator["steps"][5]["tilegrid"],
         "animator": coordinator["steps"][5]["animator"],
-        "offscreen_loc": (letters_x_start + (32 + 3) * 3 - 3, letters_y_start),
         "onscreen_loc": (letters_x_start + (32 + 3) * 3 - 3, 52),
-        "move_duration": 0.3,
+        "move_duration": 300,
         "overshoot_pixels": 22,
         "eased_value": None,
         "sprite_anim_range": (19, 27),
-        "sprite_delay": 1 / 22,
-        "start_time": 4.00,
-        "sprite_anim_start": 0.15,
-        "started": False,
+        "sprite_delay": round(1000 / 22),
+        "start_time": 4000,
+        "sprite_anim_start": 150,
     },
 )
 # T bounce up from M impact
 coordinator["steps"].append(
     {
         "type": "animation_step",
-        "tilegrid": coordinator["steps"][6]["tilegrid"],
         "animator": coordinator["steps"][6]["animator"],
-        "offscreen_loc": (letters_x_start + (32 + 3) * 3 + 16 + 3 - 4, letters_y_start),
         "onscreen_loc": (letters_x_start + (32 + 3) * 3 + 16 + 3 - 4, 52),
-        "move_duration": 0.3,
+        "move_duration": 300,
         "overshoot_pixels": 22,
         "eased_value": None,
         "sprite_anim_range": (19, 27),
-        "sprite_delay": 1 / 22,
-        "start_time": 4.1,
-        "sprite_anim_start": 0.15,
-        "started": False,
+        "sprite_delay": round(1000 / 22),
+        "start_time": 4100,
+        "sprite_anim_start": 150,
     },
 )
 # color red
 coordinator["steps"].append(
     {
-        "start_time": 4.75,
+        "start_time": 4750,
         "type": "change_palette",
         "new_palette": "red_palette",
         "color": 0xFF0000,
-        "started": False,
     }
 )
 # color yellow
 coordinator["steps"].append(
     {
-        "start_time": 5,
+        "start_time": 5000,
         "type": "change_palette",
         "new_palette": "yellow_palette",
         "color": 0xFFFF00,
-        "started": False,
     }
 )
 # color teal
 coordinator["steps"].append(
     {
-        "start_time": 5.25,
+        "start_time": 5250,
         "type": "change_palette",
         "new_palette": "teal_palette",
         "color": 0x00FFFF,
-        "started": False,
     }
 )
 # color pink
 coordinator["steps"].append(
     {
-        "start_time": 5.5,
+        "start_time": 5500,
         "type": "change_palette",
         "new_palette": "pink_palette",
         "color": 0xFF00FF,
-        "started": False,
     }
 )
 # color blue
 coordinator["steps"].append(
     {
-        "start_time": 5.75,
+        "start_time": 5750,
         "type": "change_palette",
         "new_palette": "blue_palette",
         "color": 0x0000FF,
-        "started": False,
     }
 )
 # color green
 coordinator["steps"].append(
     {
-        "start_time": 6.00,
+        "start_time": 6000,
         "type": "change_palette",
         "new_palette": "green_palette",
         "color": 0x00FF00,
-        "started": False,
     }
 )
 # Apple eyes blink
 coordinator["steps"].append(
     {
         "type": "animation_step",
-        "tilegrid": coordinator["steps"][0]["tilegrid"],
         "animator": coordinator["steps"][0]["animator"],
-        "offscreen_loc": (0, -207),
         "onscreen_loc": (0, 21),
-        "move_duration": 0.01,
+        "move_duration": 10,
         "overshoot_pixels": 0,
         "eased_value": None,
         "sprite_anim_range": (12, 27),
-        "sprite_delay": 1 / 32,
-        "start_time": 6.65,
-        "sprite_anim_start": 0.0,
-        "started": False,
+        "sprite_delay": round(1000 / 32),
+        "start_time": 6650,
+        "sprite_anim_start": 0,
     }
 )
 # Apple eyes blink again
 coordinator["steps"].append(
     {
         "type": "animation_step",
-        "tilegrid": coordinator["steps"][0]["tilegrid"],
         "animator": coordinator["steps"][0]["animator"],
-        "offscreen_loc": (0, -207),
         "onscreen_loc": (0, 21),
-        "move_duration": 0.01,
+        "move_duration": 10,
         "overshoot_pixels": 0,
         "eased_value": None,
         "sprite_anim_range": (12, 18),
-        "sprite_delay": 1 / 32,
-        "start_time": 8.75,
-        "sprite_anim_start": 0.0,
-        "started": False,
+        "sprite_delay": round(1000 / 32),
+        "start_time": 8750,
+        "sprite_anim_start": 0,
     }
 )
 
+
+def make_kickoff(step):
+    """
+    Bind everything a step needs to start, so the main loop only has to call it.
+
+    Kickoffs take the current frame's ticks_ms() value. Animation kickoffs
+    return the animator to tick, color changes return None.
+    """
+    if step["type"] == "change_palette":
+        color = step["color"]
+
+        def change_color(_now):
+            # every sprite draws with one of these two palettes, so recoloring
+            # them recolors everything
+            fruit_sprites_palette[1] = color
+            jam_sprites_palette[1] = color
+
+        return change_color
+
+    animator = step["animator"]
+    onscreen_x, onscreen_y = step["onscreen_loc"]
+    animate_kwargs = {
+        "duration": step["move_duration"],
+        "overshoot_pixels": step["overshoot_pixels"],
+        "eased_value": step["eased_value"],
+    }
+    if "offscreen_loc" in step:
+        # fly-on steps always start offscreen, so their overshoot point can be
+        # worked out now rather than when the step starts
+        offscreen_x, offscreen_y = step["offscreen_loc"]
+        animate_kwargs["overshoot_loc"] = overshoot_point(
+            offscreen_x, offscreen_y, onscreen_x, onscreen_y, step["overshoot_pixels"]
+        )
+    if step["sprite_anim_range"] is not None:
+        animate_kwargs["start_sprite_anim_at"] = step["sprite_anim_start"]
+        animate_kwargs["sprite_from_index"] = step["sprite_anim_range"][0]
+        animate_kwargs["sprite_to_index"] = step["sprite_anim_range"][1]
+        animate_kwargs["sprite_delay"] = step["sprite_delay"]
+
+    def start_animation(now):
+        animator.animate_to(onscreen_x, onscreen_y, now=now, **animate_kwargs)
+        return animator
+
+    return start_animation
+
+
+for step in coordinator["steps"]:
+    step["kickoff"] = make_kickoff(step)
+
 display.root_group = main_group
 
-start_time = time.monotonic()
+# kickoffs for the steps that have not started yet, latest first so the next
+# one due is always at the end, with their start times alongside so the
+# per-frame check is a plain list read, and the animators that are currently
+# running
+pending_steps = sorted(coordinator["steps"], key=lambda step: step["start_time"])
+pending_steps.reverse()
+pending = [step["kickoff"] for step in pending_steps]
+pending_start_times = [step["start_time"] for step in pending_steps]
+active = []
+
+# Clear out the setup garbage now, then keep the collector from pausing
+# mid-frame while the animation plays. One run allocates far less than the
+# Fruit Jam's PSRAM-backed heap holds.
+gc.collect()
+gc.disable()
+
+# these are called every frame, so look the functions up once
+ticks_ms = supervisor.ticks_ms
+refresh = display.refresh
+sleep = time.sleep
+
+start_time = ticks_ms()
 
 if tlv320_present:
-    fjPeriphs.play_file(wave_file, False)
+    fjPeriphs.audio.play(boot_jingle)
 
 while True:
-    now = time.monotonic()
-    still_going = True
-
-    for i in range(len(coordinator["steps"])):
-        step = coordinator["steps"][i]
-        if now - start_time >= step["start_time"]:
-            if not step["started"]:
-                step["started"] = True
-                if step["type"] == "animation_step":
-                    if step["sprite_anim_range"] is not None:
-                        step["animator"].animate_to(
-                            *step["onscreen_loc"],
-                            duration=step["move_duration"],
-                            overshoot_pixels=step["overshoot_pixels"],
-                            start_sprite_anim_at=step["sprite_anim_start"],
-                            sprite_from_index=step["sprite_anim_range"][0],
-                            sprite_to_index=step["sprite_anim_range"][1],
-                            sprite_delay=step["sprite_delay"],
-                            eased_value=step["eased_value"],
-                        )
-                    else:
-                        step["animator"].animate_to(
-                            *step["onscreen_loc"],
-                            duration=step["move_duration"],
-                            overshoot_pixels=step["overshoot_pixels"],
-                            eased_value=step["eased_value"],
-                        )
-                elif step["type"] == "change_palette":
-                    # color_sweep_all(step["color"], delay=0)
-                    for _cur_step in coordinator["steps"]:
-                        if "tilegrid" in _cur_step and isinstance(_cur_step["tilegrid"], TileGrid):
-                            _cur_step["tilegrid"].pixel_shader[1] = step["color"]
-
-            if "animator" in step:
-                if i == len(coordinator["steps"]) - 1:
-                    still_going = step["animator"].tick()
-                else:
-                    step["animator"].tick()
-            elif i == len(coordinator["steps"]) - 1:
-                still_going = False
-    # display.refresh(target_frames_per_second=TARGET_FPS)
-    display.refresh()
-
-    if not still_going:
+    now = ticks_ms()
+    elapsed = ticks_diff(now, start_time)
+
+    needs_refresh = False
+
+    while pending_start_times and elapsed >= pending_start_times[-1]:
+        pending_start_times.pop()
+        animator = pending.pop()(now)
+        if animator is None:
+            # a color change
+            needs_refresh = True
+        elif animator not in active:
+            # bounce and blink steps reuse an earlier step's animator
+            active.append(animator)
+
+    running = []
+    for animator in active:
+        if animator.tick(now):
+            running.append(animator)
+        if animator.dirty:
+            animator.dirty = False
+            needs_refresh = True
+    active = running
+
+    # only redraw when something on screen changed, otherwise yield briefly
+    if needs_refresh:
+        # display.refresh(target_frames_per_second=TARGET_FPS)
+        refresh()
+    else:
+        sleep(0.005)
+
+    if not pending and not active:
         break
 
+gc.enable()
+
 if tlv320_present:
     while fjPeriphs.audio.playing:
         pass
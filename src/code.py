@@ -28,6 +28,7 @@ from adafruit_displayio_layout.layouts.grid_layout import GridLayout
 from adafruit_fruitjam.peripherals import VALID_DISPLAY_SIZES, request_display_config
 from adafruit_usb_host_mouse import find_and_init_boot_mouse
 from launcher_config import LauncherConfig
+from ticks import ticks_diff
 
 """
 desktop launcher code.py arguments
@@ -101,6 +102,8 @@ HEIGHT = int(182 / 200 * display.height // scale)
 mouse = None
 last_left_button_state = 0
 left_button_pressed = False
+MOUSE_POLL_INTERVAL = 8  # milliseconds
+last_mouse_poll = supervisor.ticks_ms()
 if launcher_config.use_mouse:
     mouse = find_and_init_boot_mouse()
     if mouse:
@@ -138,18 +141,37 @@ config = {
     "height": 2,
 }
 
-cell_width = WIDTH // config["width"]
-cell_height = HEIGHT // config["height"]
-page_size = config["width"] * config["height"]
+GRID_WIDTH = config["width"]
+GRID_HEIGHT = config["height"]
+cell_width = WIDTH // GRID_WIDTH
+cell_height = HEIGHT // GRID_HEIGHT
+page_size = GRID_WIDTH * GRID_HEIGHT
 
 default_icon_bmp, default_icon_palette = adafruit_imageload.load("launcher_assets/default_icon.bmp")
 default_icon_palette.make_transparent(0)
+
+# decoded app icons by path, so paging back and forth doesn't reload them
+icon_cache = {}
+ICON_CACHE_SIZE = page_size * 2
+
+
+def _load_icon(icon_file):
+    icon = icon_cache.get(icon_file)
+    if icon is None:
+        if len(icon_cache) >= ICON_CACHE_SIZE:
+            # drop the icon that was loaded first
+            del icon_cache[next(iter(icon_cache))]
+        icon = adafruit_imageload.load(icon_file)
+        icon_cache[icon_file] = icon
+    return icon
+
+
 menu_grid = GridLayout(
     x=(display.width // scale - WIDTH) // 2,
     y=(display.height // scale - HEIGHT) // 2,
     width=WIDTH,
     height=HEIGHT,
-    grid_size=(config["width"], config["height"]),
+    grid_size=(GRID_WIDTH, GRID_HEIGHT),
     divider_lines=False,
 )
 scaled_group.append(menu_grid)
@@ -160,53 +182,128 @@ menu_title_txt.anchored_position = (display.width // (2 * scale), 2)
 scaled_group.append(menu_title_txt)
 
 app_titles = []
-apps = []
 app_paths = (pathlib.Path("/apps"), pathlib.Path("/sd/apps"))
 
 pages = [{}]
 
 cur_file_index = 0
 
-for app_path in app_paths:
-    if not app_path.exists():
-        continue
+# The app list from the last full scan, saved with what that scan read from
+# each app directory so later boots can reuse it until something it depends
+# on is added, removed or changed.
+APPS_MANIFEST = "/saves/apps_manifest.json"
+
+
+def _exists(path):
+    try:
+        os.stat(path)
+    except OSError:
+        return False
+    return True
+
+
+def _metadata_stamp(app_dir):
+    try:
+        stat = os.stat(app_dir + "/metadata.json")
+    except OSError:
+        return None
+    return [stat[6], stat[8]]  # size, mtime
 
-    for path in app_path.iterdir():
-        print(path)
 
-        code_file = path / "code.py"
-        if not code_file.exists():
+def _app_dirs():
+    app_dirs = []
+    for app_path in app_paths:
+        if not app_path.exists():
+            continue
+        for name in os.listdir(str(app_path)):
+            app_dirs.append(f"{app_path}/{name}")
+    return app_dirs
+
+
+def _scan_apps(app_dirs):
+    # each directory also gets a manifest entry recording what the scan found:
+    # [app_dir, has code.py, metadata.json stamp, icon path, icon exists].
+    # Paths are built as plain strings and each check is a single os.stat().
+    apps = []
+    dirs = []
+    for app_dir in app_dirs:
+        print(app_dir)
+
+        if not _exists(app_dir + "/code.py"):
+            dirs.append([app_dir, False, None, None, False])
             continue
 
-        metadata_file = path / "metadata.json"
-        if not metadata_file.exists():
-            metadata_file = None
-            metadata = None
-        if metadata_file is not None:
-            with open(metadata_file.absolute()) as f:
+        metadata_stamp = _metadata_stamp(app_dir)
+        metadata = None
+        if metadata_stamp is not None:
+            with open(app_dir + "/metadata.json") as f:
                 metadata = json.load(f)
 
         if metadata is not None and "icon" in metadata:
-            icon_file = path / metadata["icon"]
+            icon_file = metadata["icon"]
+            if not icon_file.startswith("/"):
+                icon_file = f"{app_dir}/{icon_file}"
         else:
-            icon_file = path / "icon.bmp"
-
-        if not icon_file.exists():
-            icon_file = None
+            icon_file = app_dir + "/icon.bmp"
+        has_icon = _exists(icon_file)
 
         if metadata is not None and "title" in metadata:
             title = metadata["title"]
         else:
-            title = path.name
+            title = app_dir.rsplit("/", 1)[-1]
 
+        dirs.append([app_dir, True, metadata_stamp, icon_file, has_icon])
         apps.append(
             {
                 "title": title,
-                "icon": str(icon_file.absolute()) if icon_file is not None else None,
-                "file": str(code_file.absolute()),
-                "dir": path,
+                "icon": icon_file if has_icon else None,
+                "file": app_dir + "/code.py",
+                "dir": pathlib.Path(app_dir),
             }
         )
+    return apps, dirs
+
+
+def _manifest_is_current(manifest, app_dirs):
+    # repeat only the checks the scan's result depends on
+    dirs = manifest.get("dirs")
+    if dirs is None or [entry[0] for entry in dirs] != app_dirs:
+        return False
+    for app_dir, has_code, metadata_stamp, icon_path, has_icon in dirs:
+        if _exists(app_dir + "/code.py") != has_code:
+            return False
+        if has_code and (
+            _metadata_stamp(app_dir) != metadata_stamp or _exists(icon_path) != has_icon
+        ):
+            return False
+    return True
+
+
+app_dirs = _app_dirs()
+try:
+    with open(APPS_MANIFEST, "rb") as f:
+        manifest = json.loads(f.read())
+except (OSError, ValueError):
+    manifest = None
+
+if manifest is not None and _manifest_is_current(manifest, app_dirs):
+    apps = manifest["apps"]
+    for app in apps:
+        app["dir"] = pathlib.Path(app["dir"])
+else:
+    apps, manifest_dirs = _scan_apps(app_dirs)
+    try:
+        with open(APPS_MANIFEST, "w") as f:
+            json.dump(
+                {
+                    "dirs": manifest_dirs,
+                    "apps": [dict(app, dir=str(app["dir"])) for app in apps],
+                },
+                f,
+            )
+    except OSError:
+        # /saves isn't writable, scan again next time
+        pass
 
 apps = sorted(apps, key=lambda app: app["title"].lower())
 
@@ -221,6 +318,8 @@ if len(launcher_config.favorites):
                 apps.remove(app)
                 apps.insert(0, app)
 
+page_count = math.ceil(len(apps) / page_size)
+
 
 def reuse_cell(grid_coords):
     try:
@@ -237,7 +336,7 @@ def _create_cell_group(app):
         icon_tg = displayio.TileGrid(bitmap=default_icon_bmp, pixel_shader=default_icon_palette)
         cell_group.append(icon_tg)
     else:
-        icon_bmp, icon_palette = adafruit_imageload.load(app["icon"])
+        icon_bmp, icon_palette = _load_icon(app["icon"])
         icon_tg = displayio.TileGrid(bitmap=icon_bmp, pixel_shader=icon_palette)
         cell_group.append(icon_tg)
 
@@ -264,7 +363,7 @@ def _reuse_cell_group(app, cell_group):
         icon_tg.bitmap = default_icon_bmp
         icon_tg.pixel_shader = default_icon_palette
     else:
-        icon_bmp, icon_palette = adafruit_imageload.load(app["icon"])
+        icon_bmp, icon_palette = _load_icon(app["icon"])
         icon_tg = cell_group[0]
         icon_tg.bitmap = icon_bmp
         icon_tg.pixel_shader = icon_palette
@@ -291,33 +390,37 @@ def _unhide_cell_group(cell_group):
     cell_group[0].hidden = False
 
 
+# the cell group at each grid index (y * width + x), all created up front so
+# paging only ever updates or hides them
+cells = []
+for grid_index in range(page_size):
+    cell_group = _create_cell_group({"title": "      ", "icon": None})
+    _hide_cell_group(cell_group)
+    menu_grid.add_content(
+        cell_group,
+        grid_position=(grid_index % GRID_WIDTH, grid_index // GRID_WIDTH),
+        cell_size=(1, 1),
+    )
+    cells.append(cell_group)
+
+
 def display_page(page_index):
-    max_pages = math.ceil(len(apps) / page_size)
-    page_txt.text = f"{page_index + 1}/{max_pages}"
+    page_txt.text = f"{page_index + 1}/{page_count}"
 
     for grid_index in range(page_size):
-        grid_pos = (grid_index % config["width"], grid_index // config["width"])
+        cell_group = cells[grid_index]
         try:
             cur_app = apps[grid_index + (page_index * page_size)]
         except IndexError:
-            try:
-                cell_group = menu_grid.get_content(grid_pos)
-                _hide_cell_group(cell_group)
-            except KeyError:
-                pass
+            _hide_cell_group(cell_group)
 
             # skip to the next for loop iteration
             continue
 
-        try:
-            cell_group = menu_grid.get_content(grid_pos)
-            _reuse_cell_group(cur_app, cell_group)
-        except KeyError:
-            cell_group = _create_cell_group(cur_app)
-            menu_grid.add_content(cell_group, grid_position=grid_pos, cell_size=(1, 1))
+        _reuse_cell_group(cur_app, cell_group)
 
         # app_titles.append(title_txt)
-        print(f"{grid_index} | {grid_index % config["width"], grid_index // config["width"]}")
+        print(f"{grid_index} | {grid_index % GRID_WIDTH, grid_index // GRID_WIDTH}")
 
 
 page_txt = Label(terminalio.FONT, text="", scale=scale, color=launcher_config.palette_fg)
@@ -383,9 +486,13 @@ selected = None
 
 def change_selected(new_selected):
     global selected
+    # nothing to redraw, e.g. when a key is held against the edge of the grid
+    if new_selected == selected:
+        return
+
     # tuple means an item in the grid is selected
     if isinstance(selected, tuple):
-        menu_grid.get_content(selected)[1].background_color = None
+        cells[selected[1] * GRID_WIDTH + selected[0]][1].background_color = None
 
     # TileGrid means arrow is selected
     elif isinstance(selected, AnchoredTileGrid):
@@ -393,7 +500,8 @@ def change_selected(new_selected):
 
     # tuple means an item in the grid is selected
     if isinstance(new_selected, tuple):
-        menu_grid.get_content(new_selected)[1].background_color = launcher_config.palette_accent
+        new_cell = cells[new_selected[1] * GRID_WIDTH + new_selected[0]]
+        new_cell[1].background_color = launcher_config.palette_accent
     # TileGrid means arrow is selected
     elif isinstance(new_selected, AnchoredTileGrid):
         new_selected.pixel_shader[2] = launcher_config.palette_accent
@@ -405,7 +513,7 @@ change_selected((0, 0))
 
 def page_right():
     global cur_page
-    if cur_page < math.ceil(len(apps) / page_size) - 1:
+    if cur_page < page_count - 1:
         cur_page += 1
         display_page(cur_page)
 
@@ -423,7 +531,7 @@ def handle_key_press(key):
     # up key
     if key == "\x1b[A":
         if isinstance(selected, tuple):
-            change_selected((selected[0], (selected[1] - 1) % config["height"]))
+            change_selected((selected[0], (selected[1] - 1) % GRID_HEIGHT))
         elif selected is left_tg:
             change_selected((0, 0))
         elif selected is right_tg:
@@ -432,7 +540,7 @@ def handle_key_press(key):
     # down key
     elif key == "\x1b[B":
         if isinstance(selected, tuple):
-            change_selected((selected[0], (selected[1] + 1) % config["height"]))
+            change_selected((selected[0], (selected[1] + 1) % GRID_HEIGHT))
         elif selected is left_tg:
             change_selected((0, 1))
         elif selected is right_tg:
@@ -447,7 +555,7 @@ def handle_key_press(key):
             elif not left_tg.hidden:
                 change_selected(left_tg)
             else:
-                change_selected(((selected[0] - 1) % config["width"], selected[1]))
+                change_selected(((selected[0] - 1) % GRID_WIDTH, selected[1]))
         elif selected is left_tg:
             change_selected(right_tg)
         elif selected is right_tg:
@@ -461,7 +569,7 @@ def handle_key_press(key):
             elif not right_tg.hidden:
                 change_selected(right_tg)
             else:
-                change_selected(((selected[0] + 1) % config["width"], selected[1]))
+                change_selected(((selected[0] + 1) % GRID_WIDTH, selected[1]))
         elif selected is left_tg:
             change_selected((0, 0))
         elif selected is right_tg:
@@ -469,7 +577,7 @@ def handle_key_press(key):
 
     elif key == "\n":
         if isinstance(selected, tuple):
-            index = (selected[1] * config["width"] + selected[0]) + (cur_page * page_size)
+            index = (selected[1] * GRID_WIDTH + selected[0]) + (cur_page * page_size)
             if index >= len(apps):
                 index = None
             print("go!")
@@ -480,7 +588,7 @@ def handle_key_press(key):
 
     elif key == "e":
         if isinstance(selected, tuple):
-            editor_index = (selected[1] * config["width"] + selected[0]) + (cur_page * page_size)
+            editor_index = (selected[1] * GRID_WIDTH + selected[0]) + (cur_page * page_size)
             if editor_index >= len(apps):
                 editor_index = None
 
@@ -489,14 +597,12 @@ def handle_key_press(key):
     elif key in "123456789":
         if key != "9":
             requested_page = int(key)
-            max_page = math.ceil(len(apps) / page_size)
-            if requested_page <= max_page:
+            if requested_page <= page_count:
                 cur_page = requested_page - 1
                 display_page(requested_page - 1)
         else:  # key == 9
-            max_page = math.ceil(len(apps) / page_size)
-            cur_page = max_page - 1
-            display_page(max_page - 1)
+            cur_page = page_count - 1
+            display_page(page_count - 1)
 
     # page up key
     elif key == "\x1b[5~":
@@ -527,13 +633,17 @@ while True:
         last_interaction_time = now
         # app_titles[selected].background_color = launcher_config.palette_accent
 
-    if mouse:
+    ticks = supervisor.ticks_ms()
+    if mouse and ticks_diff(ticks, last_mouse_poll) >= MOUSE_POLL_INTERVAL:
+        last_mouse_poll = ticks
         buttons = mouse.update()
 
-        if [mouse.x, mouse.y] != previous_mouse_location:
+        mouse_x = mouse.x
+        mouse_y = mouse.y
+        if mouse_x != previous_mouse_location[0] or mouse_y != previous_mouse_location[1]:
             last_interaction_time = now
-        previous_mouse_location[0] = mouse.x
-        previous_mouse_location[1] = mouse.y
+        previous_mouse_location[0] = mouse_x
+        previous_mouse_location[1] = mouse_y
 
         # Extract button states
         if buttons is None:
@@ -555,9 +665,7 @@ while True:
             last_interaction_time = now
             clicked_cell = menu_grid.which_cell_contains((mouse_tg.x, mouse_tg.y))
             if clicked_cell is not None:
-                index = (clicked_cell[1] * config["width"] + clicked_cell[0]) + (
-                    cur_page * page_size
-                )
+                index = (clicked_cell[1] * GRID_WIDTH + clicked_cell[0]) + (cur_page * page_size)
 
             if right_tg.contains((mouse_tg.x, mouse_tg.y, 0)):
                 page_right()
@@ -60,9 +60,9 @@ class LauncherConfig:
         for directory in ("/sd/", "/", "/saves/"):
             launcher_config_path = directory + "launcher.conf.json"
             if pathlib.Path(launcher_config_path).exists():
-                with open(launcher_config_path) as f:
+                with open(launcher_config_path, "rb") as f:
                     try:
-                        data = json.load(f)
+                        data = json.loads(f.read())
                     except (AttributeError, ValueError):
                         pass
                     else:
@@ -295,8 +295,8 @@ class LauncherConfig:
         data = None
         if pathlib.Path("/saves/launcher.conf.json").exists():
             try:
-                with open("/saves/launcher.conf.json") as f:
-                    data = json.load(f)
+                with open("/saves/launcher.conf.json", "rb") as f:
+                    data = json.loads(f.read())
             except (AttributeError, ValueError, OSError):
                 pass
 
@@ -0,0 +1,16 @@
+# SPDX-FileCopyrightText: 2025 Tim Cocks for Adafruit Industries
+# SPDX-License-Identifier: MIT
+"""
+supervisor.ticks_ms() arithmetic shared by boot_animation.py and code.py
+"""
+
+# supervisor.ticks_ms() wraps around at 2**29
+_TICKS_PERIOD = 1 << 29
+_TICKS_MAX = _TICKS_PERIOD - 1
+_TICKS_HALFPERIOD = _TICKS_PERIOD // 2
+
+
+def ticks_diff(ticks1, ticks2):
+    """Milliseconds from ticks2 to ticks1, correct across a ticks_ms() wraparound."""
+    diff = (ticks1 - ticks2) & _TICKS_MAX
+    return ((diff + _TICKS_HALFPERIOD) & _TICKS_MAX) - _TICKS_HALFPERIOD